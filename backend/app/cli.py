@@ -0,0 +1,61 @@
+"""Command line entry points.
+
+Usage:
+    python -m app.cli export --format ndjson --output exports/
+    python -m app.cli archive
+    python -m app.cli upgrade-schema
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from app.database import engine, upgrade_schema
+from app.services.archive import archive_expired_wishlists
+from app.services.export import FULL_COLUMNS, full_export_statement, stream_export
+
+
+async def export_all(fmt: str, output: Path):
+    output.mkdir(parents=True, exist_ok=True)
+    for dataset in FULL_COLUMNS:
+        path = output / f"{dataset}.{fmt}"
+        with path.open("w", encoding="utf-8", newline="") as f:
+            async for chunk in stream_export(full_export_statement(dataset), fmt):
+                f.write(chunk)
+        print(f"Exported {dataset} -> {path}")
+    await engine.dispose()
+
+
+async def archive():
+    archived = await archive_expired_wishlists()
+    print(f"Archived {archived} wishlists")
+    await engine.dispose()
+
+
+async def upgrade():
+    await upgrade_schema()
+    print("Schema is up to date")
+    await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Export the full database")
+    export.add_argument("--format", choices=["csv", "ndjson"], default="ndjson")
+    export.add_argument("--output", type=Path, default=Path("exports"))
+
+    commands.add_parser("archive", help="Archive wishlists whose event is past the grace period")
+    commands.add_parser("upgrade-schema", help="Add extensions and indexes missing from an existing database")
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        asyncio.run(export_all(args.format, args.output))
+    elif args.command == "archive":
+        asyncio.run(archive())
+    elif args.command == "upgrade-schema":
+        asyncio.run(upgrade())
+
+
+if __name__ == "__main__":
+    main()
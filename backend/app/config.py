@@ -7,6 +7,50 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
     CORS_ORIGINS: str = "http://localhost:3000"
+    DB_CREATE_SCHEMA: bool = False
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    EXPORT_BATCH_SIZE: int = 1000
+    ARCHIVE_ENABLED: bool = False
+    ARCHIVE_GRACE_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 100
+    ARCHIVE_INTERVAL_SECONDS: int = 3600
+    SOCKET_BINARY_ENABLED: bool = True
+    PRESENCE_MAX_ROOMS_PER_CONNECTION: int = 20
+    PRESENCE_BROADCAST_INTERVAL_SECONDS: float = 2.0
+    PUBLIC_CACHE_TTL_SECONDS: float = 5.0
+    PUBLIC_CACHE_MAX_ENTRIES: int = 10000
+    PUBLIC_CACHE_MAX_STALE_SECONDS: float = 300.0
+    PUBLIC_READ_TIMEOUT_SECONDS: float = 5.0
+    PUBLIC_BREAKER_FAILURE_RATE: float = 0.5
+    PUBLIC_BREAKER_MIN_CALLS: int = 10
+    PUBLIC_BREAKER_WINDOW_SECONDS: float = 30.0
+    PUBLIC_BREAKER_RESET_SECONDS: float = 15.0
+    SLUG_MISS_CACHE_SIZE: int = 100000
+    SLUG_MISS_CACHE_TTL_SECONDS: float = 300.0
+    SLUG_BLOOM_ENABLED: bool = False
+    SLUG_BLOOM_CAPACITY: int = 1000000
+    SLUG_BLOOM_ERROR_RATE: float = 0.01
+    ADMIN_TOKEN: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_FILES: int = 100
+    SCHEDULER_ENABLED: bool = True
+    SCHEDULER_RETRY_AFTER_SECONDS: int = 1
+    AUTH_CONCURRENCY: int = 4
+    AUTH_QUEUE_SIZE: int = 32
+    AUTH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    PUBLIC_READ_CONCURRENCY: int = 64
+    PUBLIC_READ_QUEUE_SIZE: int = 256
+    PUBLIC_READ_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    OWNER_READ_CONCURRENCY: int = 32
+    OWNER_READ_QUEUE_SIZE: int = 128
+    OWNER_READ_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    CONTRIBUTION_WRITE_CONCURRENCY: int = 8
+    CONTRIBUTION_WRITE_QUEUE_SIZE: int = 64
+    CONTRIBUTION_WRITE_QUEUE_TIMEOUT_SECONDS: float = 5.0
+    WEBSOCKET_CONCURRENCY: int = 5000
+    WEBSOCKET_QUEUE_SIZE: int = 0
+    WEBSOCKET_QUEUE_TIMEOUT_SECONDS: float = 1.0
 
     model_config = {"env_file": ".env"}
 
@@ -1,16 +1,96 @@
+from sqlalchemy import DDL, event, func, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import StaticPool
 
 from app.config import settings
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+
+engine_options = {}
+if is_sqlite and (":memory:" in settings.DATABASE_URL or settings.DATABASE_URL.endswith("://")):
+    # An in-memory database only lives as long as its connection
+    engine_options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+
+engine = create_async_engine(settings.DATABASE_URL, echo=False, **engine_options)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+if is_sqlite:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        # Let SQLAlchemy emit BEGIN itself so write paths can ask for BEGIN IMMEDIATE
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin_sqlite(conn):
+        conn.exec_driver_sql(conn.get_execution_options().get("sqlite_begin", "BEGIN"))
+
 
 class Base(DeclarativeBase):
     pass
 
 
+# Trigram indexes back the search endpoint on Postgres
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+
+
+def sql_uuid4():
+    """A fresh UUID generated by the database, for INSERT ... SELECT."""
+    if is_sqlite:
+        # Matches how the Uuid type stores values on SQLite: 32 hex digits,
+        # with the version 4 nibble and the RFC 4122 variant bits set
+        return literal_column(
+            "lower(hex(randomblob(6)) || '4' || substr(hex(randomblob(2)), 2)"
+            " || substr('89ab', 1 + abs(random()) % 4, 1) || substr(hex(randomblob(8)), 2))"
+        )
+    return func.gen_random_uuid()
+
+
+async def create_schema():
+    import app.models  # noqa: F401 - registers every table on Base.metadata
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+# DDL added after the first release. create_all() skips tables that already
+# exist, indexes included, so databases created earlier are brought up to
+# date by `python -m app.cli upgrade-schema`: missing tables (the archive)
+# first, then these idempotent statements.
+POSTGRES_UPGRADES = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_wishlists_title_trgm ON wishlists USING gin (title gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_wishlists_occasion_trgm ON wishlists USING gin (occasion gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_items_name_trgm ON items USING gin (name gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_wishlists_event_date ON wishlists (event_date)",
+]
+SQLITE_UPGRADES = [
+    "CREATE INDEX IF NOT EXISTS ix_wishlists_event_date ON wishlists (event_date)",
+]
+
+
+async def upgrade_schema():
+    await create_schema()
+    if is_sqlite:
+        async with engine.begin() as conn:
+            for statement in SQLITE_UPGRADES:
+                await conn.exec_driver_sql(statement)
+        return
+
+    async with engine.connect() as conn:
+        # CREATE INDEX CONCURRENTLY builds without blocking writes but can't
+        # run inside a transaction
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for statement in POSTGRES_UPGRADES:
+            await conn.exec_driver_sql(statement)
+
+
 async def get_db():
     async with async_session() as session:
         try:
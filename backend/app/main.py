@@ -1,12 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import socketio
 
 from app.config import settings
-from app.routers import auth, wishlists, items, contributions
-from app.websocket.manager import sio
+from app.database import create_schema, engine, is_sqlite
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.scheduler import SchedulerMiddleware
+from app.routers import auth, wishlists, items, contributions, exports, admin, search
+from app.services.archive import check_archive_tables, run_archiver
+from app.services.search import is_postgres, search_index
+from app.services.slug_filter import slug_filter
+from app.websocket.manager import sio, run_presence_broadcaster
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if is_sqlite or settings.DB_CREATE_SCHEMA:
+        await create_schema()
+    await check_archive_tables()
+    if not is_postgres:
+        await search_index.build()
+    await slug_filter.build()
+
+    tasks = [asyncio.create_task(run_presence_broadcaster())]
+    if settings.ARCHIVE_ENABLED:
+        tasks.append(asyncio.create_task(run_archiver()))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await engine.dispose()
+
+
+app = FastAPI(title="Social Wishlist API", version="1.0.0", lifespan=lifespan)
 
-app = FastAPI(title="Social Wishlist API", version="1.0.0")
+# Load shedding sits inside CORS so browsers can read a 503 and its Retry-After
+app.add_middleware(SchedulerMiddleware, scope_types=("http",))
 
 # CORS
 origins = [o.strip() for o in settings.CORS_ORIGINS.split(",")]
@@ -16,16 +50,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
+app.add_middleware(ProfilingMiddleware)
 
 # Routers
 app.include_router(auth.router)
 app.include_router(wishlists.router)
 app.include_router(items.router)
 app.include_router(contributions.router)
+app.include_router(exports.router)
+app.include_router(search.router)
+app.include_router(admin.router)
 
-# Socket.IO
-socket_app = socketio.ASGIApp(sio, other_asgi_app=app)
+# Socket.IO, behind the route-class scheduler so WebSockets are admitted too
+socket_app = SchedulerMiddleware(socketio.ASGIApp(sio, other_asgi_app=app), scope_types=("websocket",))
 
 
 @app.get("/api/health")
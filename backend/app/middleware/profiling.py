@@ -0,0 +1,155 @@
+import asyncio
+import cProfile
+import io
+import json
+import pstats
+import random
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import jwt as pyjwt
+from sqlalchemy import event
+
+from app.config import settings
+from app.database import engine
+
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_NAME_RE = re.compile(r"[0-9]{13}-[0-9a-f]{8}")
+
+# SQL statements executed by the request currently being profiled
+_sql_log: ContextVar[list | None] = ContextVar("profiling_sql_log", default=None)
+_profiling_active = False
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _sql_log.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    log = _sql_log.get()
+    if log is not None and conn.info.get("profiling_started"):
+        started = conn.info["profiling_started"].pop()
+        log.append({"statement": statement, "ms": round((time.perf_counter() - started) * 1000, 3)})
+
+
+def create_profile_token(minutes: int = 60) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(minutes=minutes)
+    return pyjwt.encode({"scope": "profile", "exp": expire}, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+
+
+def _has_valid_token(scope) -> bool:
+    token = dict(scope["headers"]).get(PROFILE_HEADER)
+    if not token:
+        return False
+    try:
+        payload = pyjwt.decode(token.decode(), settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+    except (pyjwt.PyJWTError, UnicodeDecodeError):
+        return False
+    return payload.get("scope") == "profile"
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+def _write_profile(profiler: cProfile.Profile, meta: dict):
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = meta["name"]
+    profiler.dump_stats(directory / f"{name}.prof")
+    (directory / f"{name}.json").write_text(json.dumps(meta))
+
+    # Keep the directory a bounded ring: drop the oldest profiles
+    metas = sorted(directory.glob("*.json"))
+    for old in metas[: max(0, len(metas) - settings.PROFILING_MAX_FILES)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+
+
+def list_profiles() -> list[dict]:
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    return [json.loads(p.read_text()) for p in sorted(directory.glob("*.json"), reverse=True)]
+
+
+def profile_path(name: str) -> Path | None:
+    if not PROFILE_NAME_RE.fullmatch(name):
+        return None
+    path = profile_dir() / f"{name}.prof"
+    return path if path.is_file() else None
+
+
+def read_profile(name: str, limit: int = 40) -> dict | None:
+    path = profile_path(name)
+    if path is None:
+        return None
+    meta = json.loads(path.with_suffix(".json").read_text())
+    out = io.StringIO()
+    pstats.Stats(str(path), stream=out).sort_stats("cumulative").print_stats(limit)
+    meta["stats"] = out.getvalue()
+    return meta
+
+
+class ProfilingMiddleware:
+    """Profile a request with cProfile when it carries a valid
+    ``X-Profile-Token`` header or is picked by ``PROFILING_SAMPLE_RATE``.
+
+    cProfile sees the whole event loop, so concurrent requests show up in
+    the profile too; only one request is profiled at a time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _profiling_active
+
+        if scope["type"] != "http" or _profiling_active or not (
+            _has_valid_token(scope) or random.random() < settings.PROFILING_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        _profiling_active = True
+        sql_log = []
+        token = _sql_log.set(sql_log)
+        status_code = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.disable()
+            duration_ms = (time.perf_counter() - started) * 1000
+            _sql_log.reset(token)
+            _profiling_active = False
+
+            route = scope.get("route")
+            meta = {
+                "name": f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}",
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+                "sql_count": len(sql_log),
+                "sql_ms": round(sum(s["ms"] for s in sql_log), 3),
+                "sql": sql_log,
+            }
+            await asyncio.to_thread(_write_profile, profiler, meta)
@@ -0,0 +1,96 @@
+from starlette.responses import JSONResponse
+from starlette.websockets import WebSocketClose
+
+from app.config import settings
+from app.services.resilience import ConcurrencyLimiter
+
+# Long-polling Socket.IO requests hold a connection for the whole poll
+# interval; preflights, health checks and the admin API must stay
+# reachable while everything else is being shed
+EXEMPT_PREFIXES = ("/socket.io/", "/api/health", "/api/admin/")
+AUTH_PATHS = ("/api/auth/login", "/api/auth/register")
+
+# Close code for "try again later"
+WS_TRY_AGAIN_LATER = 1013
+
+
+def route_class(scope) -> str | None:
+    if scope["type"] == "websocket":
+        return "websocket"
+    path = scope["path"]
+    method = scope["method"]
+    if method == "OPTIONS" or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if method == "POST" and path.rstrip("/") in AUTH_PATHS:
+        return "auth"
+    if path.startswith("/api/wishlists/public/"):
+        return "public_read"
+    if method != "GET" and path.startswith("/api/items/") and "/contributions" in path:
+        return "contribution_write"
+    return "owner_read"
+
+
+class Scheduler:
+    """One ConcurrencyLimiter per route class, so a spike in one class
+    (bcrypt logins, locked contribution writes) queues and sheds on its own
+    instead of starving the others."""
+
+    CLASSES = ("auth", "public_read", "owner_read", "contribution_write", "websocket")
+
+    def __init__(self):
+        self.limiters = {
+            name: ConcurrencyLimiter(
+                getattr(settings, f"{name.upper()}_CONCURRENCY"),
+                getattr(settings, f"{name.upper()}_QUEUE_SIZE"),
+                getattr(settings, f"{name.upper()}_QUEUE_TIMEOUT_SECONDS"),
+            )
+            for name in self.CLASSES
+        }
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+scheduler = Scheduler()
+
+
+async def _shed(scope, receive, send):
+    if scope["type"] == "websocket":
+        await WebSocketClose(code=WS_TRY_AGAIN_LATER)(scope, receive, send)
+        return
+    response = JSONResponse(
+        {"detail": "Server is busy, try again shortly"},
+        status_code=503,
+        headers={"Retry-After": str(settings.SCHEDULER_RETRY_AFTER_SECONDS)},
+    )
+    await response(scope, receive, send)
+
+
+class SchedulerMiddleware:
+    """Admit HTTP requests and WebSocket connections through their route
+    class's limiter, shedding them with 503 + Retry-After (or close code
+    1013) when its queue is full or the wait times out.
+
+    Installed twice: inside CORSMiddleware for HTTP, so shed responses keep
+    their CORS headers, and around the Socket.IO app for WebSockets, which
+    never reach FastAPI. A WebSocket holds its slot until it disconnects.
+    """
+
+    def __init__(self, app, scope_types: tuple[str, ...] = ("http", "websocket")):
+        self.app = app
+        self.scope_types = scope_types
+
+    async def __call__(self, scope, receive, send):
+        name = route_class(scope) if scope["type"] in self.scope_types else None
+        if name is None or not settings.SCHEDULER_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = scheduler.limiters[name]
+        if not await limiter.acquire():
+            await _shed(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -2,5 +2,9 @@ from app.models.user import User
 from app.models.wishlist import Wishlist
 from app.models.item import Item
 from app.models.contribution import Contribution
+from app.models.archive import ArchivedWishlist, ArchivedItem, ArchivedContribution
 
-__all__ = ["User", "Wishlist", "Item", "Contribution"]
+__all__ = [
+    "User", "Wishlist", "Item", "Contribution",
+    "ArchivedWishlist", "ArchivedItem", "ArchivedContribution",
+]
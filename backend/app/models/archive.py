@@ -0,0 +1,55 @@
+import uuid
+from datetime import datetime, date
+
+from sqlalchemy import String, Integer, DateTime, Date, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+# Cold copies of wishlists whose event is long past. Rows are moved here by
+# app.services.archive and keep their original ids and slugs.
+
+class ArchivedWishlist(Base):
+    __tablename__ = "archived_wishlists"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    occasion: Mapped[str | None] = mapped_column(String, nullable=True)
+    event_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    slug: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    currency: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class ArchivedItem(Base):
+    __tablename__ = "archived_items"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    wishlist_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("archived_wishlists.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    name: Mapped[str] = mapped_column(String, nullable=False)
+    link: Mapped[str | None] = mapped_column(String, nullable=True)
+    price: Mapped[int] = mapped_column(Integer, nullable=False)
+    image_url: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+
+class ArchivedContribution(Base):
+    __tablename__ = "archived_contributions"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    item_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("archived_items.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    archived_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -17,5 +17,5 @@ class User(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    wishlists = relationship("Wishlist", back_populates="owner", cascade="all, delete-orphan")
-    contributions = relationship("Contribution", back_populates="user", cascade="all, delete-orphan")
+    wishlists = relationship("Wishlist", back_populates="owner", cascade="all, delete-orphan", passive_deletes=True)
+    contributions = relationship("Contribution", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
@@ -2,7 +2,7 @@ import uuid
 import secrets
 from datetime import datetime, date
 
-from sqlalchemy import String, DateTime, Date, ForeignKey
+from sqlalchemy import String, DateTime, Date, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -19,11 +19,19 @@ class Wishlist(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     title: Mapped[str] = mapped_column(String, nullable=False)
     occasion: Mapped[str | None] = mapped_column(String, nullable=True)
-    event_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    # Indexed for the archiver's event_date < cutoff batches
+    event_date: Mapped[date | None] = mapped_column(Date, nullable=True, index=True)
     slug: Mapped[str] = mapped_column(String, unique=True, nullable=False, default=generate_slug)
     currency: Mapped[str] = mapped_column(String, nullable=False, default="EUR")
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        Index("ix_wishlists_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"})
+        .ddl_if(dialect="postgresql"),
+        Index("ix_wishlists_occasion_trgm", "occasion", postgresql_using="gin", postgresql_ops={"occasion": "gin_trgm_ops"})
+        .ddl_if(dialect="postgresql"),
+    )
+
     owner = relationship("User", back_populates="wishlists")
-    items = relationship("Item", back_populates="wishlist", cascade="all, delete-orphan")
+    items = relationship("Item", back_populates="wishlist", cascade="all, delete-orphan", passive_deletes=True)
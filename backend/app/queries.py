@@ -0,0 +1,79 @@
+"""Catalog of the hot query shapes, defined once as lambda statements.
+
+SQLAlchemy analyses each lambda the first time it runs and caches the
+construct and its compiled SQL by the lambda's code location; later calls
+only pull fresh bound values out of the closure, skipping statement
+construction and cache-key generation. Values used inside the lambdas
+must be plain parameters (ids, strings), never SQL expressions.
+"""
+from sqlalchemy import select, func, lambda_stmt
+
+from app.models.user import User
+from app.models.wishlist import Wishlist
+from app.models.item import Item
+from app.models.contribution import Contribution
+
+
+def user_by_id(user_id):
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def user_by_email(email: str):
+    return lambda_stmt(lambda: select(User).where(User.email == email))
+
+
+def wishlist_by_owner(wishlist_id, user_id):
+    return lambda_stmt(lambda: select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user_id))
+
+
+def wishlists_by_owner(user_id):
+    return lambda_stmt(lambda: select(Wishlist).where(Wishlist.user_id == user_id).order_by(Wishlist.created_at.desc()))
+
+
+def wishlist_by_slug(slug: str):
+    return lambda_stmt(lambda: select(Wishlist).where(Wishlist.slug == slug))
+
+
+def wishlist_exists(wishlist_id):
+    return lambda_stmt(lambda: select(Wishlist.id).where(Wishlist.id == wishlist_id))
+
+
+def item_in_wishlist(item_id, wishlist_id):
+    return lambda_stmt(lambda: select(Item).where(Item.id == item_id, Item.wishlist_id == wishlist_id))
+
+
+def item_for_update(item_id):
+    return lambda_stmt(lambda: select(Item).where(Item.id == item_id).with_for_update())
+
+
+def contribution_by_item_and_user(item_id, user_id):
+    return lambda_stmt(
+        lambda: select(Contribution).where(Contribution.item_id == item_id, Contribution.user_id == user_id)
+    )
+
+
+def item_funding(item_id):
+    """(total, count) of the positive contributions to one item."""
+    return lambda_stmt(
+        lambda: select(
+            func.coalesce(func.sum(Contribution.amount), 0).label("total"),
+            func.count(Contribution.id).label("count"),
+        ).where(Contribution.item_id == item_id, Contribution.amount > 0)
+    )
+
+
+def items_with_funding(wishlist_id, item=Item, contribution=Contribution):
+    """(item, total, count) rows of a wishlist in display order. Also reads
+    the archive tables when given their models; model classes in the
+    closure are part of the cache key."""
+    return lambda_stmt(
+        lambda: select(
+            item,
+            func.coalesce(func.sum(contribution.amount), 0).label("total"),
+            func.count(contribution.id).label("count"),
+        )
+        .outerjoin(contribution, (contribution.item_id == item.id) & (contribution.amount > 0))
+        .where(item.wishlist_id == wishlist_id)
+        .group_by(item.id)
+        .order_by(item.created_at)
+    )
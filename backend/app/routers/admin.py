@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.middleware.profiling import create_profile_token, list_profiles, profile_path, read_profile
+from app.middleware.scheduler import scheduler
+from app.services.auth import require_admin
+from app.services.public_cache import public_cache, public_breaker
+from app.services.slug_filter import slug_filter
+from app.websocket.manager import presence
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/metrics")
+async def get_metrics():
+    return {
+        "public_reads": {"cache": public_cache.stats(), "breaker": public_breaker.stats()},
+        "slugs": slug_filter.stats(),
+        "scheduler": scheduler.stats(),
+    }
+
+
+@router.get("/presence")
+async def get_presence():
+    return presence.stats()
+
+
+@router.post("/profiles/token")
+async def issue_profile_token(minutes: int = 60):
+    return {"header": "X-Profile-Token", "token": create_profile_token(minutes)}
+
+
+@router.get("/profiles")
+async def get_profiles():
+    return [{k: v for k, v in meta.items() if k != "sql"} for meta in list_profiles()]
+
+
+@router.get("/profiles/{name}")
+async def get_profile(name: str):
+    meta = read_profile(name)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return meta
+
+
+@router.get("/profiles/{name}/raw")
+async def download_profile(name: str):
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, filename=path.name)
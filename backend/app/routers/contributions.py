@@ -1,13 +1,17 @@
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text
+from sqlalchemy import text
 
 from app.database import get_db
+from app import queries
 from app.models.user import User
-from app.models.item import Item
 from app.models.contribution import Contribution
 from app.schemas.contribution import ContributionCreate, ContributionUpdate, ContributionResponse
 from app.services.auth import get_current_user
+from app.services.locking import lock_item
+from app.services.public_cache import public_cache
 from app.routers.wishlists import compute_item_status
 from app.websocket.manager import broadcast_item_update
 
@@ -15,34 +19,26 @@ router = APIRouter(prefix="/api/items/{item_id}/contributions", tags=["contribut
 
 
 async def get_item_funding_info(db: AsyncSession, item_id):
-    result = await db.execute(
-        select(
-            func.coalesce(func.sum(Contribution.amount), 0).label("total"),
-            func.count(Contribution.id).label("count"),
-        ).where(Contribution.item_id == item_id, Contribution.amount > 0)
-    )
+    result = await db.execute(queries.item_funding(item_id))
     row = result.one()
     return int(row.total), int(row.count)
 
 
 @router.post("/", response_model=ContributionResponse, status_code=status.HTTP_201_CREATED)
 async def create_contribution(
-    item_id: str,
+    item_id: uuid.UUID,
     data: ContributionCreate,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Lock the item row to prevent race conditions
-    result = await db.execute(
-        select(Item).where(Item.id == item_id).with_for_update()
-    )
-    item = result.scalar_one_or_none()
+    item = await lock_item(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
     # Check existing contribution by this user
     existing = await db.execute(
-        select(Contribution).where(Contribution.item_id == item_id, Contribution.user_id == user.id)
+        queries.contribution_by_item_and_user(item_id, user.id)
     )
     if existing.scalar_one_or_none():
         raise HTTPException(status_code=400, detail="You already have a contribution for this item. Use PUT to update.")
@@ -65,6 +61,7 @@ async def create_contribution(
     db.add(contribution)
     await db.commit()
     await db.refresh(contribution)
+    public_cache.invalidate(item.wishlist_id)
 
     # Broadcast update
     new_total, new_count = await get_item_funding_info(db, item_id)
@@ -76,15 +73,12 @@ async def create_contribution(
 
 @router.post("/reserve", response_model=ContributionResponse, status_code=status.HTTP_201_CREATED)
 async def reserve_item(
-    item_id: str,
+    item_id: uuid.UUID,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Lock the item row
-    result = await db.execute(
-        select(Item).where(Item.id == item_id).with_for_update()
-    )
-    item = result.scalar_one_or_none()
+    item = await lock_item(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
@@ -95,7 +89,7 @@ async def reserve_item(
 
     # Check existing contribution by this user
     existing = await db.execute(
-        select(Contribution).where(Contribution.item_id == item_id, Contribution.user_id == user.id)
+        queries.contribution_by_item_and_user(item_id, user.id)
     )
     if existing.scalar_one_or_none():
         raise HTTPException(status_code=400, detail="You already have a contribution for this item")
@@ -109,6 +103,7 @@ async def reserve_item(
     db.add(contribution)
     await db.commit()
     await db.refresh(contribution)
+    public_cache.invalidate(item.wishlist_id)
 
     # Broadcast
     await broadcast_item_update(str(item.wishlist_id), str(item.id), item.price, 1, "FULLY_FUNDED")
@@ -118,22 +113,19 @@ async def reserve_item(
 
 @router.put("/", response_model=ContributionResponse)
 async def update_contribution(
-    item_id: str,
+    item_id: uuid.UUID,
     data: ContributionUpdate,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Lock item
-    result = await db.execute(
-        select(Item).where(Item.id == item_id).with_for_update()
-    )
-    item = result.scalar_one_or_none()
+    item = await lock_item(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
     # Find existing contribution
     result = await db.execute(
-        select(Contribution).where(Contribution.item_id == item_id, Contribution.user_id == user.id)
+        queries.contribution_by_item_and_user(item_id, user.id)
     )
     contribution = result.scalar_one_or_none()
     if not contribution:
@@ -156,6 +148,7 @@ async def update_contribution(
 
     await db.commit()
     await db.refresh(contribution)
+    public_cache.invalidate(item.wishlist_id)
 
     # Broadcast
     new_total, new_count = await get_item_funding_info(db, item_id)
@@ -167,12 +160,12 @@ async def update_contribution(
 
 @router.get("/mine", response_model=ContributionResponse | None)
 async def get_my_contribution(
-    item_id: str,
+    item_id: uuid.UUID,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
-        select(Contribution).where(Contribution.item_id == item_id, Contribution.user_id == user.id)
+        queries.contribution_by_item_and_user(item_id, user.id)
     )
     contribution = result.scalar_one_or_none()
     if not contribution:
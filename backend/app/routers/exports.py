@@ -0,0 +1,24 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.models.user import User
+from app.services.auth import get_current_user
+from app.services.export import EXPORT_FORMATS, owner_export_statement, stream_export
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: Literal["wishlists", "items", "contributions"],
+    format: Literal["csv", "ndjson"] = "csv",
+    user: User = Depends(get_current_user),
+):
+    stmt = owner_export_statement(dataset, user.id)
+    return StreamingResponse(
+        stream_export(stmt, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'},
+    )
@@ -1,40 +1,35 @@
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 
 from app.database import get_db
+from app import queries
 from app.models.user import User
-from app.models.wishlist import Wishlist
 from app.models.item import Item
-from app.models.contribution import Contribution
 from app.schemas.item import ItemCreate, ItemUpdate, ItemResponse
 from app.services.auth import get_current_user
+from app.services.public_cache import public_cache
+from app.services.search import search_index
 from app.routers.wishlists import compute_item_status
 
 router = APIRouter(prefix="/api/wishlists/{wishlist_id}/items", tags=["items"])
 
 
 async def get_item_funding(db: AsyncSession, item_id):
-    result = await db.execute(
-        select(
-            func.coalesce(func.sum(Contribution.amount), 0).label("total"),
-            func.count(Contribution.id).label("count"),
-        ).where(Contribution.item_id == item_id, Contribution.amount > 0)
-    )
+    result = await db.execute(queries.item_funding(item_id))
     row = result.one()
     return int(row.total), int(row.count)
 
 
 @router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_item(
-    wishlist_id: str,
+    wishlist_id: uuid.UUID,
     data: ItemCreate,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user.id)
-    )
+    result = await db.execute(queries.wishlist_by_owner(wishlist_id, user.id))
     wishlist = result.scalar_one_or_none()
     if not wishlist:
         raise HTTPException(status_code=404, detail="Wishlist not found")
@@ -49,6 +44,8 @@ async def create_item(
     db.add(item)
     await db.commit()
     await db.refresh(item)
+    search_index.index_item(user.id, item)
+    public_cache.invalidate(wishlist_id)
 
     return ItemResponse(
         id=item.id,
@@ -67,7 +64,7 @@ async def create_item(
 
 @router.get("/", response_model=list[ItemResponse])
 async def list_items(
-    wishlist_id: str,
+    wishlist_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
 ):
     from app.routers.wishlists import get_items_with_funding
@@ -76,19 +73,17 @@ async def list_items(
 
 @router.put("/{item_id}", response_model=ItemResponse)
 async def update_item(
-    wishlist_id: str,
-    item_id: str,
+    wishlist_id: uuid.UUID,
+    item_id: uuid.UUID,
     data: ItemUpdate,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user.id)
-    )
+    result = await db.execute(queries.wishlist_by_owner(wishlist_id, user.id))
     if not result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="Wishlist not found")
 
-    result = await db.execute(select(Item).where(Item.id == item_id, Item.wishlist_id == wishlist_id))
+    result = await db.execute(queries.item_in_wishlist(item_id, wishlist_id))
     item = result.scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
@@ -103,6 +98,8 @@ async def update_item(
 
     await db.commit()
     await db.refresh(item)
+    search_index.index_item(user.id, item)
+    public_cache.invalidate(wishlist_id)
 
     return ItemResponse(
         id=item.id,
@@ -121,21 +118,21 @@ async def update_item(
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_item(
-    wishlist_id: str,
-    item_id: str,
+    wishlist_id: uuid.UUID,
+    item_id: uuid.UUID,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user.id)
-    )
+    result = await db.execute(queries.wishlist_by_owner(wishlist_id, user.id))
     if not result.scalar_one_or_none():
         raise HTTPException(status_code=404, detail="Wishlist not found")
 
-    result = await db.execute(select(Item).where(Item.id == item_id, Item.wishlist_id == wishlist_id))
+    result = await db.execute(queries.item_in_wishlist(item_id, wishlist_id))
     item = result.scalar_one_or_none()
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
 
     await db.delete(item)
     await db.commit()
+    search_index.remove_item(user.id, item.id)
+    public_cache.invalidate(wishlist_id)
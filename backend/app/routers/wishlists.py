@@ -1,19 +1,31 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, insert, literal, case
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, async_session, sql_uuid4
+from app import queries
 from app.models.user import User
 from app.models.wishlist import Wishlist
 from app.models.item import Item
 from app.models.contribution import Contribution
-from app.schemas.wishlist import WishlistCreate, WishlistUpdate, WishlistResponse
+from app.schemas.wishlist import WishlistCreate, WishlistUpdate, WishlistDuplicate, WishlistResponse
 from app.schemas.item import ItemResponse
 from app.services.auth import get_current_user
+from app.services.archive import get_archived_public_wishlist
+from app.services.public_cache import DB_UNAVAILABLE_ERRORS, public_cache, public_breaker, get_public_db
+from app.services.search import search_index
+from app.services.slug_filter import slug_filter
 
 router = APIRouter(prefix="/api/wishlists", tags=["wishlists"])
 
+# Keeps background revalidation tasks referenced until they finish
+_background_tasks: set[asyncio.Task] = set()
+
 
 def compute_item_status(total_funded: int, price: int) -> str:
     if total_funded <= 0:
@@ -23,23 +35,13 @@ def compute_item_status(total_funded: int, price: int) -> str:
     return "PARTIALLY_FUNDED"
 
 
-async def get_items_with_funding(db: AsyncSession, wishlist_id):
-    result = await db.execute(
-        select(Item).where(Item.wishlist_id == wishlist_id).order_by(Item.created_at)
-    )
-    items = result.scalars().all()
+async def get_items_with_funding(db: AsyncSession, wishlist_id, item_model=Item, contribution_model=Contribution):
+    result = await db.execute(queries.items_with_funding(wishlist_id, item_model, contribution_model))
 
     item_responses = []
-    for item in items:
-        contrib_result = await db.execute(
-            select(
-                func.coalesce(func.sum(Contribution.amount), 0).label("total"),
-                func.count(Contribution.id).label("count"),
-            ).where(Contribution.item_id == item.id, Contribution.amount > 0)
-        )
-        row = contrib_result.one()
-        total_funded = int(row.total)
-        contributor_count = int(row.count)
+    for item, total, count in result.all():
+        total_funded = int(total or 0)
+        contributor_count = int(count or 0)
         status = compute_item_status(total_funded, item.price)
 
         item_responses.append(
@@ -76,6 +78,8 @@ async def create_wishlist(
     db.add(wishlist)
     await db.commit()
     await db.refresh(wishlist)
+    search_index.index_wishlist(wishlist)
+    slug_filter.add(wishlist.slug)
     return WishlistResponse.model_validate(wishlist)
 
 
@@ -84,19 +88,17 @@ async def list_wishlists(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Wishlist).where(Wishlist.user_id == user.id).order_by(Wishlist.created_at.desc())
-    )
+    result = await db.execute(queries.wishlists_by_owner(user.id))
     return [WishlistResponse.model_validate(w) for w in result.scalars().all()]
 
 
 @router.get("/{wishlist_id}", response_model=WishlistResponse)
 async def get_wishlist(
-    wishlist_id: str,
+    wishlist_id: uuid.UUID,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user.id))
+    result = await db.execute(queries.wishlist_by_owner(wishlist_id, user.id))
     wishlist = result.scalar_one_or_none()
     if not wishlist:
         raise HTTPException(status_code=404, detail="Wishlist not found")
@@ -105,12 +107,12 @@ async def get_wishlist(
 
 @router.put("/{wishlist_id}", response_model=WishlistResponse)
 async def update_wishlist(
-    wishlist_id: str,
+    wishlist_id: uuid.UUID,
     data: WishlistUpdate,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user.id))
+    result = await db.execute(queries.wishlist_by_owner(wishlist_id, user.id))
     wishlist = result.scalar_one_or_none()
     if not wishlist:
         raise HTTPException(status_code=404, detail="Wishlist not found")
@@ -121,33 +123,101 @@ async def update_wishlist(
 
     await db.commit()
     await db.refresh(wishlist)
+    search_index.index_wishlist(wishlist)
+    public_cache.invalidate(wishlist.id)
     return WishlistResponse.model_validate(wishlist)
 
 
 @router.delete("/{wishlist_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_wishlist(
-    wishlist_id: str,
+    wishlist_id: uuid.UUID,
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user.id))
+    result = await db.execute(queries.wishlist_by_owner(wishlist_id, user.id))
     wishlist = result.scalar_one_or_none()
     if not wishlist:
         raise HTTPException(status_code=404, detail="Wishlist not found")
 
     await db.delete(wishlist)
     await db.commit()
+    search_index.remove_wishlist(user.id, wishlist.id)
+    public_cache.evict(wishlist.slug)
+    slug_filter.remove(wishlist.slug)
 
 
-@router.get("/public/{slug}")
-async def get_public_wishlist(slug: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Wishlist).where(Wishlist.slug == slug))
-    wishlist = result.scalar_one_or_none()
-    if not wishlist:
-        raise HTTPException(status_code=404, detail="This wishlist no longer exists.")
+@router.post("/{wishlist_id}/duplicate", response_model=WishlistResponse, status_code=status.HTTP_201_CREATED)
+async def duplicate_wishlist(
+    wishlist_id: uuid.UUID,
+    data: WishlistDuplicate,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    result = await db.execute(queries.wishlist_by_owner(wishlist_id, user.id))
+    source = result.scalar_one_or_none()
+    if not source:
+        raise HTTPException(status_code=404, detail="Wishlist not found")
+
+    wishlist = Wishlist(
+        user_id=user.id,
+        title=data.title or source.title,
+        occasion=source.occasion,
+        event_date=data.event_date,
+        currency=source.currency,
+    )
+    db.add(wishlist)
+    await db.flush()
+
+    # Copy every item in one INSERT ... SELECT; contributions stay behind.
+    # created_at is kept so the copies list in the original order.
+    items = select(
+        sql_uuid4(),
+        literal(wishlist.id, Item.wishlist_id.type),
+        Item.name,
+        Item.link,
+        Item.price,
+        Item.image_url,
+        Item.created_at,
+        func.now(),
+    ).where(Item.wishlist_id == source.id)
+
+    if data.statuses is not None:
+        funding = (
+            select(Contribution.item_id, func.sum(Contribution.amount).label("total"))
+            .join(Item, Item.id == Contribution.item_id)
+            .where(Item.wishlist_id == source.id, Contribution.amount > 0)
+            .group_by(Contribution.item_id)
+            .subquery()
+        )
+        total = func.coalesce(funding.c.total, 0)
+        item_status = case(
+            (total <= 0, "AVAILABLE"),
+            (total >= Item.price, "FULLY_FUNDED"),
+            else_="PARTIALLY_FUNDED",
+        )
+        items = items.outerjoin(funding, funding.c.item_id == Item.id).where(item_status.in_(data.statuses))
+
+    copied = await db.execute(
+        insert(Item)
+        .from_select(["id", "wishlist_id", "name", "link", "price", "image_url", "created_at", "updated_at"], items)
+        .returning(Item.id, Item.wishlist_id, Item.name)
+    )
+    copied_items = copied.all()
+    await db.commit()
+
+    search_index.index_wishlist(wishlist)
+    slug_filter.add(wishlist.slug)
+    for item in copied_items:
+        search_index.index_item(user.id, item)
+    return WishlistResponse.model_validate(wishlist)
 
-    items = await get_items_with_funding(db, wishlist.id)
 
+async def build_public_payload(
+    db: AsyncSession, wishlist, item_model=Item, contribution_model=Contribution, archived: bool = False
+) -> dict:
+    """The public view of a live wishlist, or of an archived one when given
+    the archive models."""
+    items = await get_items_with_funding(db, wishlist.id, item_model, contribution_model)
     return {
         "id": str(wishlist.id),
         "title": wishlist.title,
@@ -155,5 +225,105 @@ async def get_public_wishlist(slug: str, db: AsyncSession = Depends(get_db)):
         "event_date": str(wishlist.event_date) if wishlist.event_date else None,
         "slug": wishlist.slug,
         "currency": wishlist.currency,
+        "archived": archived,
         "items": [item.model_dump() for item in items],
     }
+
+
+async def load_public_wishlist(db: AsyncSession, slug: str) -> dict | None:
+    result = await db.execute(queries.wishlist_by_slug(slug))
+    wishlist = result.scalar_one_or_none()
+    if not wishlist:
+        # Lists whose event is long past live in the archive tables
+        return await get_archived_public_wishlist(db, slug)
+    return await build_public_payload(db, wishlist)
+
+
+async def _load_guarded(db: AsyncSession, slug: str) -> dict | None:
+    """Load a public payload, reporting the outcome to the circuit breaker."""
+    try:
+        async with asyncio.timeout(settings.PUBLIC_READ_TIMEOUT_SECONDS):
+            payload = await load_public_wishlist(db, slug)
+    except DB_UNAVAILABLE_ERRORS:
+        public_breaker.record_failure()
+        raise
+    public_breaker.record_success()
+    return payload
+
+
+async def _revalidate(slug: str):
+    if not public_breaker.allow():
+        public_cache.revalidating.discard(slug)
+        return
+    is_probe = public_breaker.state == public_breaker.HALF_OPEN
+    version = public_cache.version(slug)
+    try:
+        async with async_session() as db:
+            payload = await _load_guarded(db, slug)
+        if payload is None:
+            public_cache.evict(slug)
+        else:
+            # A write that committed during the read has invalidated the entry
+            public_cache.put_if_unchanged(slug, payload, version)
+    except DB_UNAVAILABLE_ERRORS:
+        pass
+    finally:
+        if is_probe:
+            public_breaker.release()
+        public_cache.revalidating.discard(slug)
+
+
+def _serve_stale(response: Response, payload: dict) -> dict:
+    response.headers["X-Cache"] = "STALE"
+    return payload
+
+
+def _unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Wishlists are temporarily unavailable.",
+        headers={"Retry-After": str(public_breaker.retry_after())},
+    )
+
+
+@router.get("/public/{slug}")
+async def get_public_wishlist(slug: str, response: Response, db: AsyncSession | None = Depends(get_public_db)):
+    slug_filter.record_lookup()
+    entry = public_cache.get(slug)
+    if entry is not None and entry.is_fresh():
+        response.headers["X-Cache"] = "HIT"
+        return entry.payload
+
+    if entry is not None and entry.is_servable_stale():
+        # Stale-while-revalidate: one background refresh per slug
+        if slug not in public_cache.revalidating:
+            public_cache.revalidating.add(slug)
+            task = asyncio.create_task(_revalidate(slug))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+        return _serve_stale(response, entry.payload)
+
+    if entry is None and not slug_filter.might_exist(slug):
+        raise HTTPException(status_code=404, detail="This wishlist no longer exists.")
+
+    if db is None:
+        if entry is not None:
+            return _serve_stale(response, entry.payload)
+        raise _unavailable()
+
+    version = public_cache.version(slug)
+    try:
+        payload = await _load_guarded(db, slug)
+    except DB_UNAVAILABLE_ERRORS:
+        if entry is not None:
+            return _serve_stale(response, entry.payload)
+        raise _unavailable()
+
+    if payload is None:
+        public_cache.evict(slug)
+        slug_filter.record_miss(slug)
+        raise HTTPException(status_code=404, detail="This wishlist no longer exists.")
+
+    public_cache.put_if_unchanged(slug, payload, version)
+    response.headers["X-Cache"] = "MISS"
+    return payload
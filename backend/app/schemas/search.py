@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+import uuid
+from typing import Literal
+
+
+class SearchResult(BaseModel):
+    kind: Literal["wishlist", "item"]
+    id: uuid.UUID
+    wishlist_id: uuid.UUID
+    title: str
+    score: float
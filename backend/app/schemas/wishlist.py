@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field
+from typing import Literal
 import uuid
 from datetime import datetime, date
 
@@ -16,6 +17,12 @@ class WishlistUpdate(BaseModel):
     event_date: date | None = None
 
 
+class WishlistDuplicate(BaseModel):
+    title: str | None = Field(None, min_length=1, max_length=200)
+    event_date: date | None = None
+    statuses: list[Literal["AVAILABLE", "PARTIALLY_FUNDED", "FULLY_FUNDED"]] | None = None
+
+
 class WishlistResponse(BaseModel):
     id: uuid.UUID
     user_id: uuid.UUID
@@ -0,0 +1,120 @@
+"""Moves wishlists whose event is long past into the archived_* tables.
+
+Archived lists are read-only and leave the owner's API: list_wishlists,
+get_wishlist and the item/contribution routes only see live rows. They
+stay reachable through their public slug (served with ``archived: true``),
+the owner exports and the ``archived_*`` datasets of the full export.
+"""
+import asyncio
+import logging
+from datetime import date, timedelta
+
+from sqlalchemy import select, insert, delete, func, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session, engine, is_sqlite
+from app.models.wishlist import Wishlist
+from app.models.item import Item
+from app.models.contribution import Contribution
+from app.models.archive import ArchivedWishlist, ArchivedItem, ArchivedContribution
+from app.services.search import search_index
+
+logger = logging.getLogger(__name__)
+
+# Cleared at startup on a database that predates the archive tables, so
+# public slug misses don't fail on a missing table until upgrade-schema runs
+archive_tables_ready = True
+
+
+async def check_archive_tables() -> bool:
+    global archive_tables_ready
+    async with engine.connect() as conn:
+        archive_tables_ready = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).has_table(ArchivedWishlist.__tablename__)
+        )
+    if not archive_tables_ready:
+        logger.warning(
+            "Archive tables are missing; archival and archived lookups are off until "
+            "`python -m app.cli upgrade-schema` runs"
+        )
+    return archive_tables_ready
+
+
+def _copy(source, target, where):
+    """INSERT INTO target SELECT source.*, now() FROM source WHERE ..."""
+    columns = [c.name for c in source.__table__.columns]
+    return insert(target).from_select(
+        [*columns, "archived_at"],
+        select(*source.__table__.columns, func.now()).where(where),
+    )
+
+
+async def archive_batch(db: AsyncSession, cutoff: date, batch_size: int) -> list:
+    """Move up to ``batch_size`` wishlists whose event ended before ``cutoff``
+    into the archive tables, in the caller's transaction. Returns their
+    (id, user_id) rows."""
+    stmt = select(Wishlist.id, Wishlist.user_id).where(Wishlist.event_date < cutoff).order_by(Wishlist.event_date).limit(batch_size)
+    if not is_sqlite:
+        stmt = stmt.with_for_update(skip_locked=True)
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return rows
+
+    wishlist_ids = [row.id for row in rows]
+
+    item_ids = select(Item.id).where(Item.wishlist_id.in_(wishlist_ids))
+    if not is_sqlite:
+        # Contribution writers hold their item's row lock (lock_item); taking
+        # the same locks keeps a contribution from committing between the
+        # copy below and the cascading delete
+        await db.execute(item_ids.order_by(Item.id).with_for_update())
+    await db.execute(_copy(Wishlist, ArchivedWishlist, Wishlist.id.in_(wishlist_ids)))
+    await db.execute(_copy(Item, ArchivedItem, Item.wishlist_id.in_(wishlist_ids)))
+    await db.execute(_copy(Contribution, ArchivedContribution, Contribution.item_id.in_(item_ids)))
+    # Items and contributions follow through ON DELETE CASCADE
+    await db.execute(delete(Wishlist).where(Wishlist.id.in_(wishlist_ids)))
+    return rows
+
+
+async def archive_expired_wishlists() -> int:
+    """Archive every wishlist past its grace period, one bounded
+    transaction per batch."""
+    cutoff = date.today() - timedelta(days=settings.ARCHIVE_GRACE_DAYS)
+    total = 0
+    while True:
+        async with async_session() as db:
+            await db.connection(execution_options={"sqlite_begin": "BEGIN IMMEDIATE"})
+            archived = await archive_batch(db, cutoff, settings.ARCHIVE_BATCH_SIZE)
+            await db.commit()
+        for row in archived:
+            search_index.remove_wishlist(row.user_id, row.id)
+        total += len(archived)
+        if len(archived) < settings.ARCHIVE_BATCH_SIZE:
+            return total
+
+
+async def run_archiver():
+    while True:
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+        if not archive_tables_ready:
+            continue
+        try:
+            archived = await archive_expired_wishlists()
+            if archived:
+                logger.info("Archived %d wishlists", archived)
+        except Exception:
+            logger.exception("Wishlist archival failed")
+
+
+async def get_archived_public_wishlist(db: AsyncSession, slug: str) -> dict | None:
+    if not archive_tables_ready:
+        return None
+    result = await db.execute(select(ArchivedWishlist).where(ArchivedWishlist.slug == slug))
+    wishlist = result.scalar_one_or_none()
+    if not wishlist:
+        return None
+
+    from app.routers.wishlists import build_public_payload
+
+    return await build_public_payload(db, wishlist, ArchivedItem, ArchivedContribution, archived=True)
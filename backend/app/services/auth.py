@@ -1,14 +1,15 @@
+import hmac
 import uuid
 from datetime import datetime, timedelta, timezone
 
 import jwt as pyjwt
 from passlib.context import CryptContext
-from fastapi import Depends, HTTPException, status, Cookie
+from fastapi import Depends, HTTPException, status, Cookie, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
 from app.config import settings
+from app import queries
 from app.database import get_db
 from app.models.user import User
 
@@ -59,7 +60,7 @@ async def get_current_user(
     if user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(queries.user_by_id(user_id))
     user = result.scalar_one_or_none()
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
@@ -85,5 +86,10 @@ async def get_optional_user(
     if user_id is None:
         return None
 
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(queries.user_by_id(user_id))
     return result.scalar_one_or_none()
+
+
+async def require_admin(x_admin_token: str | None = Header(None)):
+    if not settings.ADMIN_TOKEN or not x_admin_token or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
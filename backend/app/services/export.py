@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime
+from typing import AsyncIterator
+
+from sqlalchemy import select, union_all, Select
+
+from app.config import settings
+from app.database import async_session
+from app.models.user import User
+from app.models.wishlist import Wishlist
+from app.models.item import Item
+from app.models.contribution import Contribution
+from app.models.archive import ArchivedWishlist, ArchivedItem, ArchivedContribution
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Columns exposed to owners downloading their own data
+OWNER_COLUMNS = {
+    "wishlists": [
+        Wishlist.id, Wishlist.title, Wishlist.occasion, Wishlist.event_date,
+        Wishlist.slug, Wishlist.currency, Wishlist.created_at, Wishlist.updated_at,
+    ],
+    "items": [
+        Item.id, Item.wishlist_id, Item.name, Item.link, Item.price,
+        Item.image_url, Item.created_at, Item.updated_at,
+    ],
+    "contributions": [
+        Contribution.id, Contribution.item_id, Contribution.amount,
+        Contribution.created_at, Contribution.updated_at,
+    ],
+}
+
+# Columns for full-database dumps (password hashes are never exported)
+FULL_COLUMNS = {
+    "users": [User.id, User.email, User.display_name, User.created_at, User.updated_at],
+    "wishlists": [Wishlist.user_id, *OWNER_COLUMNS["wishlists"]],
+    "items": OWNER_COLUMNS["items"],
+    "contributions": [Contribution.user_id, *OWNER_COLUMNS["contributions"]],
+}
+
+ARCHIVE_MODELS = {"wishlists": ArchivedWishlist, "items": ArchivedItem, "contributions": ArchivedContribution}
+
+
+def _archived_columns(model, columns: list) -> list:
+    """The archive table's counterparts of ``columns``, plus archived_at."""
+    return [*(getattr(model, c.key) for c in columns), model.archived_at]
+
+
+# Archived rows are dumped as their own datasets, so the live datasets keep
+# their columns and the nightly dump still covers every wishlist
+FULL_COLUMNS.update({
+    f"archived_{dataset}": _archived_columns(ARCHIVE_MODELS[dataset], FULL_COLUMNS[dataset])
+    for dataset in ARCHIVE_MODELS
+})
+
+
+def owner_export_statement(dataset: str, user_id) -> Select:
+    """An owner's rows of ``dataset``, live and archived alike."""
+    columns = OWNER_COLUMNS[dataset]
+    archived = [getattr(ARCHIVE_MODELS[dataset], c.key) for c in columns]
+    if dataset == "wishlists":
+        live = select(*columns).where(Wishlist.user_id == user_id)
+        cold = select(*archived).where(ArchivedWishlist.user_id == user_id)
+    elif dataset == "items":
+        live = select(*columns).join(Wishlist, Wishlist.id == Item.wishlist_id).where(Wishlist.user_id == user_id)
+        cold = (
+            select(*archived)
+            .join(ArchivedWishlist, ArchivedWishlist.id == ArchivedItem.wishlist_id)
+            .where(ArchivedWishlist.user_id == user_id)
+        )
+    else:
+        # An owner's contributions are the ones they made, not the ones
+        # received on their own items (those would spoil the surprise).
+        live = select(*columns).where(Contribution.user_id == user_id)
+        cold = select(*archived).where(ArchivedContribution.user_id == user_id)
+    rows = union_all(live, cold).subquery()
+    return select(rows).order_by(rows.c.created_at)
+
+
+def full_export_statement(dataset: str) -> Select:
+    columns = FULL_COLUMNS[dataset]
+    return select(*columns).order_by(columns[0].class_.created_at)
+
+
+def _plain(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_csv(rows) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if v is None else _plain(v) for v in row])
+    return buffer.getvalue()
+
+
+def _encode_ndjson(keys: list[str], rows) -> str:
+    return "".join(
+        json.dumps({k: _plain(v) for k, v in zip(keys, row)}, separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+async def stream_export(stmt: Select, fmt: str) -> AsyncIterator[str]:
+    """Yield encoded chunks of ``stmt`` read through a server-side cursor.
+
+    Opens its own session: the request-scoped one from ``get_db`` is closed
+    before a ``StreamingResponse`` body starts iterating.
+    """
+    keys = [c.key for c in stmt.selected_columns]
+    if fmt == "csv":
+        yield _encode_csv([keys])
+
+    async with async_session() as session:
+        result = await session.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        async for partition in result.partitions():
+            if fmt == "csv":
+                yield _encode_csv(partition)
+            else:
+                yield _encode_ndjson(keys, partition)
@@ -0,0 +1,20 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import queries
+from app.database import is_sqlite
+from app.models.item import Item
+
+
+async def lock_item(db: AsyncSession, item_id) -> Item | None:
+    """Load an item and hold a write lock on it until the session commits.
+
+    Postgres locks the row with SELECT ... FOR UPDATE. SQLite has no row
+    locks, so the read transaction opened while authenticating is ended and
+    a BEGIN IMMEDIATE transaction takes the database write lock instead.
+    """
+    if is_sqlite:
+        await db.commit()
+        await db.connection(execution_options={"sqlite_begin": "BEGIN IMMEDIATE"})
+
+    result = await db.execute(queries.item_for_update(item_id))
+    return result.scalar_one_or_none()
@@ -0,0 +1,128 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.database import async_session
+from app.services.resilience import CircuitBreaker
+
+try:
+    import asyncpg
+except ImportError:  # SQLite-only installs
+    asyncpg = None
+
+# Errors that mean the database can't serve a read. asyncpg raises
+# connection failures (refused, reset, DNS) as plain OSErrors and some
+# connect-time errors as its own exceptions, without SQLAlchemy wrapping.
+DB_UNAVAILABLE_ERRORS: tuple[type[BaseException], ...] = (TimeoutError, OSError, SQLAlchemyError)
+if asyncpg is not None:
+    DB_UNAVAILABLE_ERRORS += (asyncpg.PostgresError, asyncpg.InterfaceError)
+
+
+@dataclass
+class CachedWishlist:
+    payload: dict
+    fetched_at: float
+    invalidated: bool = False
+    # Bumped by every invalidation, so a read that started before a write
+    # can tell its payload is already out of date
+    generation: int = 0
+
+    @property
+    def wishlist_id(self) -> str:
+        return self.payload["id"]
+
+    def is_fresh(self) -> bool:
+        return not self.invalidated and time.monotonic() - self.fetched_at < settings.PUBLIC_CACHE_TTL_SECONDS
+
+    def is_servable_stale(self) -> bool:
+        """Old enough to refresh but young enough to serve while doing so.
+        Past this, readers wait for the database unless it is down."""
+        return not self.invalidated and time.monotonic() - self.fetched_at < settings.PUBLIC_CACHE_MAX_STALE_SECONDS
+
+
+class PublicWishlistCache:
+    """Bounded LRU of the last good public payload per slug.
+
+    Entries outlive their TTL on purpose: a stale copy is served while it
+    is revalidated (up to PUBLIC_CACHE_MAX_STALE_SECONDS old) and for as
+    long as the database is unavailable.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[str, CachedWishlist] = OrderedDict()
+        self.slugs: dict[str, str] = {}
+        self.revalidating: set[str] = set()
+
+    def get(self, slug: str) -> CachedWishlist | None:
+        entry = self.entries.get(slug)
+        if entry is not None:
+            self.entries.move_to_end(slug)
+        return entry
+
+    def put(self, slug: str, payload: dict):
+        self.entries[slug] = CachedWishlist(payload, time.monotonic())
+        self.entries.move_to_end(slug)
+        self.slugs[payload["id"]] = slug
+        while len(self.entries) > self.max_entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.slugs.pop(evicted.wishlist_id, None)
+
+    def version(self, slug: str) -> tuple | None:
+        """Marker of the slug's entry, taken before reading from the database."""
+        entry = self.entries.get(slug)
+        return None if entry is None else (entry, entry.generation)
+
+    def put_if_unchanged(self, slug: str, payload: dict, version: tuple | None) -> bool:
+        """Store a payload read after ``version`` was taken, unless the entry
+        has been invalidated, evicted or replaced since."""
+        entry, generation = version or (None, None)
+        current = self.entries.get(slug)
+        unchanged = current is entry and (current is None or current.generation == generation)
+        if unchanged:
+            self.put(slug, payload)
+        return unchanged
+
+    def evict(self, slug: str):
+        entry = self.entries.pop(slug, None)
+        if entry is not None:
+            self.slugs.pop(entry.wishlist_id, None)
+
+    def invalidate(self, wishlist_id):
+        """Force the next read to go to the database, keeping the old
+        payload as a fallback."""
+        slug = self.slugs.get(str(wishlist_id))
+        if slug in self.entries:
+            entry = self.entries[slug]
+            entry.invalidated = True
+            entry.generation += 1
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "revalidating": len(self.revalidating)}
+
+
+public_cache = PublicWishlistCache(settings.PUBLIC_CACHE_MAX_ENTRIES)
+public_breaker = CircuitBreaker(
+    failure_rate=settings.PUBLIC_BREAKER_FAILURE_RATE,
+    min_calls=settings.PUBLIC_BREAKER_MIN_CALLS,
+    window=settings.PUBLIC_BREAKER_WINDOW_SECONDS,
+    reset_timeout=settings.PUBLIC_BREAKER_RESET_SECONDS,
+)
+
+
+async def get_public_db():
+    """Database session for anonymous reads, or None while the breaker is open."""
+    if not public_breaker.allow():
+        yield None
+        return
+    is_probe = public_breaker.state == CircuitBreaker.HALF_OPEN
+    async with async_session() as session:
+        try:
+            yield session
+        finally:
+            if is_probe:
+                public_breaker.release()
+            await session.close()
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from collections import deque
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker.
+
+    Opens when at least ``min_calls`` outcomes in the last ``window``
+    seconds fail at ``failure_rate`` or more. After ``reset_timeout`` it
+    goes half-open and lets a single probe through; the probe's outcome
+    closes or re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_rate: float, min_calls: int, window: float, reset_timeout: float):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.outcomes: deque[tuple[float, bool]] = deque()
+        self.trips = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self):
+        """Give back a half-open probe that ended without touching the database."""
+        self.probe_in_flight = False
+
+    def retry_after(self) -> int:
+        return max(1, int(self.reset_timeout - (time.monotonic() - self.opened_at)))
+
+    def record_success(self):
+        if self.state == self.HALF_OPEN:
+            self.state = self.CLOSED
+            self.outcomes.clear()
+        self.probe_in_flight = False
+        self._record(True)
+
+    def record_failure(self):
+        self.probe_in_flight = False
+        if self.state == self.HALF_OPEN:
+            self._trip()
+            return
+        self._record(False)
+        failures = sum(1 for _, ok in self.outcomes if not ok)
+        if len(self.outcomes) >= self.min_calls and failures / len(self.outcomes) >= self.failure_rate:
+            self._trip()
+
+    def _record(self, ok: bool):
+        now = time.monotonic()
+        self.outcomes.append((now, ok))
+        while self.outcomes and now - self.outcomes[0][0] > self.window:
+            self.outcomes.popleft()
+
+    def _trip(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.outcomes.clear()
+        self.trips += 1
+
+    def stats(self) -> dict:
+        return {"state": self.state, "trips": self.trips, "rejected": self.rejected}
+
+
+class ConcurrencyLimiter:
+    """At most ``limit`` holders at a time, with a bounded FIFO queue.
+
+    ``acquire`` returns False without waiting when ``queue_size`` callers
+    are already queued, or after waiting ``queue_timeout`` seconds for a
+    slot. A released slot is handed straight to the oldest waiter.
+    """
+
+    def __init__(self, limit: int, queue_size: int, queue_timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.shed = 0
+        self.timeouts = 0
+
+    async def acquire(self) -> bool:
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            self.admitted += 1
+            return True
+        if len(self.waiters) >= self.queue_size:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._forget(waiter)
+            if not (waiter.done() and not waiter.cancelled()):
+                self.timeouts += 1
+                return False
+            # Since 3.12 wait_for times out even when the slot was handed
+            # over in the same tick; keep it rather than leak it
+        except asyncio.CancelledError:
+            self._forget(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the caller went away
+                self.release()
+            raise
+        self.admitted += 1
+        return True
+
+    def release(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _forget(self, waiter: asyncio.Future):
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": len(self.waiters),
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,170 @@
+import re
+from collections import Counter, defaultdict
+
+from sqlalchemy import select, literal, func, or_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import engine, async_session
+from app.models.wishlist import Wishlist
+from app.models.item import Item
+
+is_postgres = engine.dialect.name == "postgresql"
+
+# Minimum share of the query's trigrams a title must contain, as pg_trgm's
+# default word_similarity_threshold
+MIN_SCORE = 0.6
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of every word, padded the way pg_trgm does."""
+    grams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """In-process inverted index from trigrams to one user's documents."""
+
+    def __init__(self):
+        self.docs: dict[tuple, tuple[set[str], dict]] = {}
+        self.postings: dict[str, set[tuple]] = defaultdict(set)
+        self.by_wishlist: dict[object, set[tuple]] = defaultdict(set)
+
+    def add(self, key: tuple, text: str, payload: dict):
+        self.remove(key)
+        grams = trigrams(text)
+        self.docs[key] = (grams, payload)
+        for gram in grams:
+            self.postings[gram].add(key)
+        self.by_wishlist[payload["wishlist_id"]].add(key)
+
+    def remove(self, key: tuple):
+        entry = self.docs.pop(key, None)
+        if entry is None:
+            return
+        grams, payload = entry
+        for gram in grams:
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+        keys = self.by_wishlist[payload["wishlist_id"]]
+        keys.discard(key)
+        if not keys:
+            del self.by_wishlist[payload["wishlist_id"]]
+
+    def remove_wishlist(self, wishlist_id):
+        for key in list(self.by_wishlist.get(wishlist_id, ())):
+            self.remove(key)
+
+    def search(self, query: str, limit: int, offset: int) -> list[dict]:
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared = Counter()
+        for gram in query_grams:
+            for key in self.postings.get(gram, ()):
+                shared[key] += 1
+
+        results = []
+        for key, count in shared.items():
+            score = count / len(query_grams)
+            if score >= MIN_SCORE:
+                results.append({**self.docs[key][1], "score": round(score, 4)})
+        results.sort(key=lambda r: (-r["score"], r["title"]))
+        return results[offset:offset + limit]
+
+
+class SearchIndex:
+    """Per-user trigram indexes, used when the database has no pg_trgm.
+
+    Kept in sync by the routers, so it is only valid for a single process
+    (the embedded SQLite mode).
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.users: dict[object, TrigramIndex] = defaultdict(TrigramIndex)
+
+    async def build(self):
+        async with async_session() as db:
+            wishlists = await db.stream(select(Wishlist.id, Wishlist.user_id, Wishlist.title, Wishlist.occasion))
+            async for row in wishlists:
+                self._add_wishlist(row.user_id, row.id, row.title, row.occasion)
+            items = await db.stream(
+                select(Item.id, Item.wishlist_id, Item.name, Wishlist.user_id).join(Wishlist, Wishlist.id == Item.wishlist_id)
+            )
+            async for row in items:
+                self._add_item(row.user_id, row.id, row.wishlist_id, row.name)
+        self.enabled = True
+
+    def _add_wishlist(self, user_id, wishlist_id, title, occasion):
+        payload = {"kind": "wishlist", "id": wishlist_id, "wishlist_id": wishlist_id, "title": title}
+        self.users[user_id].add(("wishlist", wishlist_id), f"{title} {occasion or ''}", payload)
+
+    def _add_item(self, user_id, item_id, wishlist_id, name):
+        payload = {"kind": "item", "id": item_id, "wishlist_id": wishlist_id, "title": name}
+        self.users[user_id].add(("item", item_id), name, payload)
+
+    def index_wishlist(self, wishlist: Wishlist):
+        if self.enabled:
+            self._add_wishlist(wishlist.user_id, wishlist.id, wishlist.title, wishlist.occasion)
+
+    def remove_wishlist(self, user_id, wishlist_id):
+        if self.enabled and user_id in self.users:
+            self.users[user_id].remove_wishlist(wishlist_id)
+
+    def index_item(self, user_id, item: Item):
+        if self.enabled:
+            self._add_item(user_id, item.id, item.wishlist_id, item.name)
+
+    def remove_item(self, user_id, item_id):
+        if self.enabled and user_id in self.users:
+            self.users[user_id].remove(("item", item_id))
+
+    def search(self, user_id, query: str, limit: int, offset: int) -> list[dict]:
+        if user_id not in self.users:
+            return []
+        return self.users[user_id].search(query, limit, offset)
+
+
+search_index = SearchIndex()
+
+
+def _pg_search_statement(user_id, query: str, limit: int, offset: int):
+    # q <% column is answered from the gin_trgm_ops indexes
+    q = literal(query)
+    wishlists = select(
+        literal("wishlist").label("kind"),
+        Wishlist.id.label("id"),
+        Wishlist.id.label("wishlist_id"),
+        Wishlist.title.label("title"),
+        func.greatest(
+            func.word_similarity(q, Wishlist.title),
+            func.word_similarity(q, func.coalesce(Wishlist.occasion, "")),
+        ).label("score"),
+    ).where(Wishlist.user_id == user_id, or_(q.op("<%")(Wishlist.title), q.op("<%")(Wishlist.occasion)))
+    items = (
+        select(
+            literal("item"),
+            Item.id,
+            Item.wishlist_id,
+            Item.name,
+            func.word_similarity(q, Item.name),
+        )
+        .join(Wishlist, Wishlist.id == Item.wishlist_id)
+        .where(Wishlist.user_id == user_id, q.op("<%")(Item.name))
+    )
+    matches = union_all(wishlists, items).subquery()
+    return select(matches).order_by(matches.c.score.desc(), matches.c.title).limit(limit).offset(offset)
+
+
+async def search(db: AsyncSession, user_id, query: str, limit: int, offset: int) -> list[dict]:
+    if not is_postgres:
+        return search_index.search(user_id, query, limit, offset)
+    result = await db.execute(_pg_search_statement(user_id, query, limit, offset))
+    return [dict(row._mapping) for row in result]
@@ -0,0 +1,137 @@
+import hashlib
+import math
+import time
+from collections import OrderedDict
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import async_session
+from app.models.wishlist import Wishlist
+from app.models.archive import ArchivedWishlist
+from app.services import archive
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Kirsch-Mitzenmacher: k positions from two 64-bit hashes
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class MissCache:
+    """Bounded TTL set of slugs recently found not to exist."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.expires: OrderedDict[str, float] = OrderedDict()
+
+    def add(self, slug: str):
+        self.expires[slug] = time.monotonic() + self.ttl
+        self.expires.move_to_end(slug)
+        while len(self.expires) > self.max_entries:
+            self.expires.popitem(last=False)
+
+    def discard(self, slug: str):
+        self.expires.pop(slug, None)
+
+    def __contains__(self, slug: str) -> bool:
+        expires = self.expires.get(slug)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self.expires[slug]
+            return False
+        return True
+
+
+class SlugFilter:
+    """Rejects public slugs that cannot exist before they reach the database.
+
+    The Bloom filter is only exact for slugs created by this process, so
+    it is meant for single-process deployments (SLUG_BLOOM_ENABLED); the
+    miss cache is safe everywhere since slugs are random and never reused.
+    """
+
+    def __init__(self):
+        self.bloom: BloomFilter | None = None
+        self.misses = MissCache(settings.SLUG_MISS_CACHE_SIZE, settings.SLUG_MISS_CACHE_TTL_SECONDS)
+        self.lookups = 0
+        self.checks = 0
+        self.bloom_rejects = 0
+        self.cache_rejects = 0
+        self.db_misses = 0
+
+    async def build(self):
+        if not settings.SLUG_BLOOM_ENABLED:
+            return
+        bloom = BloomFilter(settings.SLUG_BLOOM_CAPACITY, settings.SLUG_BLOOM_ERROR_RATE)
+        async with async_session() as db:
+            columns = [Wishlist.slug]
+            if archive.archive_tables_ready:
+                columns.append(ArchivedWishlist.slug)
+            for column in columns:
+                slugs = await db.stream_scalars(select(column).execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+                async for slug in slugs:
+                    bloom.add(slug)
+        self.bloom = bloom
+
+    def add(self, slug: str):
+        if self.bloom is not None:
+            self.bloom.add(slug)
+        self.misses.discard(slug)
+
+    def remove(self, slug: str):
+        # A Bloom filter can't forget; the miss cache covers deleted slugs
+        self.misses.add(slug)
+
+    def record_lookup(self):
+        """Count a public read, whether or not it gets as far as the filter."""
+        self.lookups += 1
+
+    def might_exist(self, slug: str) -> bool:
+        self.checks += 1
+        if self.bloom is not None and slug not in self.bloom:
+            self.bloom_rejects += 1
+            return False
+        if slug in self.misses:
+            self.cache_rejects += 1
+            return False
+        return True
+
+    def record_miss(self, slug: str):
+        self.db_misses += 1
+        self.misses.add(slug)
+
+    def stats(self) -> dict:
+        misses = self.bloom_rejects + self.cache_rejects + self.db_misses
+        return {
+            # Every public read, including the ones answered from the cache
+            "lookups": self.lookups,
+            "checks": self.checks,
+            "misses": misses,
+            "miss_rate": round(misses / self.lookups, 4) if self.lookups else 0.0,
+            "bloom_rejects": self.bloom_rejects,
+            "cache_rejects": self.cache_rejects,
+            "db_misses": self.db_misses,
+            "bloom_enabled": self.bloom is not None,
+            "miss_cache_entries": len(self.misses.expires),
+        }
+
+
+slug_filter = SlugFilter()
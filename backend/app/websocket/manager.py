@@ -1,6 +1,46 @@
+import asyncio
+import logging
+import uuid
+
 import socketio
 
+from app.config import settings
+from app import queries
+from app.database import async_session
+from app.websocket.presence import Presence
+from app.websocket.wire import ItemInterner, encode_binary, encode_json
+
+logger = logging.getLogger(__name__)
+
 sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins=[])
+presence = Presence(settings.PRESENCE_MAX_ROOMS_PER_CONNECTION)
+
+# Item-id interning tables of the rooms that have msgpack clients
+_interners: dict[str, ItemInterner] = {}
+
+
+def _room(wishlist_id: str, binary: bool = False) -> str:
+    return f"wishlist_{wishlist_id}:msgpack" if binary else f"wishlist_{wishlist_id}"
+
+
+def _wishlist_id(data) -> str | None:
+    """The canonical form of the wishlist id in an event payload."""
+    if not isinstance(data, dict):
+        return None
+    try:
+        return str(uuid.UUID(str(data.get("wishlist_id"))))
+    except ValueError:
+        return None
+
+
+async def _wishlist_exists(wishlist_id: str) -> bool:
+    async with async_session() as db:
+        result = await db.execute(queries.wishlist_exists(uuid.UUID(wishlist_id)))
+        return result.scalar_one_or_none() is not None
+
+
+def _room_emptied(wishlist_id: str):
+    _interners.pop(wishlist_id, None)
 
 
 @sio.event
@@ -10,32 +50,73 @@ async def connect(sid, environ):
 
 @sio.event
 async def join_wishlist(sid, data):
-    wishlist_id = data.get("wishlist_id")
-    if wishlist_id:
-        sio.enter_room(sid, f"wishlist_{wishlist_id}")
+    wishlist_id = _wishlist_id(data)
+    if wishlist_id is None:
+        return {"error": "Invalid wishlist id"}
+    if not presence.has_viewers(wishlist_id) and not await _wishlist_exists(wishlist_id):
+        return {"error": "Wishlist not found"}
+    if not presence.join(sid, wishlist_id):
+        return {"error": "Too many wishlists open on this connection"}
+
+    if settings.SOCKET_BINARY_ENABLED and data.get("format") == "msgpack":
+        interner = _interners.setdefault(wishlist_id, ItemInterner())
+        await sio.enter_room(sid, _room(wishlist_id, binary=True))
+        # The client maps item ids to the indices used in item_updated_bin
+        return {"format": "msgpack", "items": interner.table()}
+
+    await sio.enter_room(sid, _room(wishlist_id))
+    return {"format": "json"}
 
 
 @sio.event
 async def leave_wishlist(sid, data):
-    wishlist_id = data.get("wishlist_id")
-    if wishlist_id:
-        sio.leave_room(sid, f"wishlist_{wishlist_id}")
+    wishlist_id = _wishlist_id(data)
+    if wishlist_id is None:
+        return
+    await sio.leave_room(sid, _room(wishlist_id))
+    await sio.leave_room(sid, _room(wishlist_id, binary=True))
+    if presence.leave(sid, wishlist_id):
+        _room_emptied(wishlist_id)
 
 
 @sio.event
 async def disconnect(sid):
-    pass
+    # Socket.IO drops the sid from its rooms itself
+    for wishlist_id in presence.disconnect(sid):
+        _room_emptied(wishlist_id)
+
+
+async def broadcast_viewer_counts():
+    for wishlist_id, viewers in presence.drain_dirty().items():
+        payload = {"type": "VIEWERS", "wishlistId": wishlist_id, "viewers": viewers}
+        await sio.emit("viewer_count", payload, room=_room(wishlist_id))
+        await sio.emit("viewer_count", payload, room=_room(wishlist_id, binary=True))
+
+
+async def run_presence_broadcaster():
+    while True:
+        await asyncio.sleep(settings.PRESENCE_BROADCAST_INTERVAL_SECONDS)
+        try:
+            await broadcast_viewer_counts()
+        except Exception:
+            logger.exception("Viewer count broadcast failed")
 
 
 async def broadcast_item_update(wishlist_id: str, item_id: str, total: int, contributors: int, status: str):
+    if not presence.has_viewers(wishlist_id):
+        return
+
     await sio.emit(
         "item_updated",
-        {
-            "type": "ITEM_UPDATED",
-            "itemId": item_id,
-            "total": total,
-            "contributors": contributors,
-            "status": status,
-        },
-        room=f"wishlist_{wishlist_id}",
+        encode_json(item_id, total, contributors, status),
+        room=_room(wishlist_id),
     )
+
+    interner = _interners.get(wishlist_id)
+    if interner is not None:
+        index, is_new = interner.intern(item_id)
+        await sio.emit(
+            "item_updated_bin",
+            encode_binary(index, total, contributors, status, item_id if is_new else None),
+            room=_room(wishlist_id, binary=True),
+        )
@@ -0,0 +1,78 @@
+import sys
+
+
+class Presence:
+    """Which sockets are viewing which wishlists.
+
+    Two indexes over the same interned strings: wishlist id -> sids and
+    sid -> wishlist ids, so joins, leaves and disconnects are O(rooms of
+    that socket). Rooms whose viewer count changed are collected in
+    ``dirty`` and broadcast in batches.
+    """
+
+    def __init__(self, max_rooms_per_connection: int):
+        self.max_rooms_per_connection = max_rooms_per_connection
+        self.rooms: dict[str, set[str]] = {}
+        self.connections: dict[str, set[str]] = {}
+        self.dirty: set[str] = set()
+
+    def join(self, sid: str, wishlist_id: str) -> bool:
+        joined = self.connections.setdefault(sid, set())
+        if wishlist_id in joined:
+            return True
+        if len(joined) >= self.max_rooms_per_connection:
+            return False
+        wishlist_id = sys.intern(wishlist_id)
+        joined.add(wishlist_id)
+        self.rooms.setdefault(wishlist_id, set()).add(sid)
+        self.dirty.add(wishlist_id)
+        return True
+
+    def leave(self, sid: str, wishlist_id: str) -> bool:
+        """Returns True when the room is now empty."""
+        joined = self.connections.get(sid)
+        if joined is None or wishlist_id not in joined:
+            return False
+        joined.discard(wishlist_id)
+        if not joined:
+            del self.connections[sid]
+        viewers = self.rooms[wishlist_id]
+        viewers.discard(sid)
+        self.dirty.add(wishlist_id)
+        if not viewers:
+            del self.rooms[wishlist_id]
+            return True
+        return False
+
+    def disconnect(self, sid: str) -> list[str]:
+        """Drops a socket from all its rooms; returns the rooms now empty."""
+        emptied = []
+        for wishlist_id in list(self.connections.get(sid, ())):
+            if self.leave(sid, wishlist_id):
+                emptied.append(wishlist_id)
+        return emptied
+
+    def has_viewers(self, wishlist_id: str) -> bool:
+        return wishlist_id in self.rooms
+
+    def drain_dirty(self) -> dict[str, int]:
+        counts = {wishlist_id: len(self.rooms[wishlist_id]) for wishlist_id in self.dirty if wishlist_id in self.rooms}
+        self.dirty.clear()
+        return counts
+
+    def memory_bytes(self) -> int:
+        # Set members are the same string objects as the other index's keys
+        size = sys.getsizeof(self.rooms) + sys.getsizeof(self.connections) + sys.getsizeof(self.dirty)
+        for wishlist_id, sids in self.rooms.items():
+            size += sys.getsizeof(wishlist_id) + sys.getsizeof(sids)
+        for sid, joined in self.connections.items():
+            size += sys.getsizeof(sid) + sys.getsizeof(joined)
+        return size
+
+    def stats(self) -> dict:
+        return {
+            "rooms": len(self.rooms),
+            "sockets": len(self.connections),
+            "memberships": sum(len(sids) for sids in self.rooms.values()),
+            "memory_bytes": self.memory_bytes(),
+        }
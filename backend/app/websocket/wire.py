@@ -0,0 +1,44 @@
+import uuid
+
+import msgpack
+
+# Compact funding packets for clients that join a room with format=msgpack:
+#   [version, item_index, total, contributors, status_code]
+# The first packet for an item also carries its 16-byte UUID as a 6th
+# element; after that only its room-local index is sent.
+PACKET_VERSION = 1
+STATUS_CODES = {"AVAILABLE": 0, "PARTIALLY_FUNDED": 1, "FULLY_FUNDED": 2}
+
+
+class ItemInterner:
+    """Small integer ids for the item ids of one wishlist room."""
+
+    def __init__(self):
+        self.ids: dict[str, int] = {}
+
+    def intern(self, item_id: str) -> tuple[int, bool]:
+        index = self.ids.get(item_id)
+        if index is not None:
+            return index, False
+        index = self.ids[item_id] = len(self.ids)
+        return index, True
+
+    def table(self) -> dict[str, int]:
+        return dict(self.ids)
+
+
+def encode_json(item_id: str, total: int, contributors: int, status: str) -> dict:
+    return {
+        "type": "ITEM_UPDATED",
+        "itemId": item_id,
+        "total": total,
+        "contributors": contributors,
+        "status": status,
+    }
+
+
+def encode_binary(index: int, total: int, contributors: int, status: str, item_id: str | None = None) -> bytes:
+    packet = [PACKET_VERSION, index, total, contributors, STATUS_CODES[status]]
+    if item_id is not None:
+        packet.append(uuid.UUID(item_id).bytes)
+    return msgpack.packb(packet)
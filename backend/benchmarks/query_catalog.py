@@ -0,0 +1,80 @@
+"""CPU per execution of the hot queries, inline select() vs the catalog.
+
+Each statement runs against an empty in-memory SQLite database, so the
+timing is dominated by statement construction, cache-key generation and
+result setup rather than by the database itself.
+
+Usage:
+    python -m benchmarks.query_catalog
+"""
+import timeit
+import uuid
+
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import Session
+
+from app import queries
+from app.database import Base
+from app.models.user import User
+from app.models.wishlist import Wishlist
+from app.models.item import Item
+from app.models.contribution import Contribution
+
+N = 20_000
+
+
+def inline_items_with_funding(wishlist_id):
+    return (
+        select(
+            Item,
+            func.coalesce(func.sum(Contribution.amount), 0).label("total"),
+            func.count(Contribution.id).label("count"),
+        )
+        .outerjoin(Contribution, (Contribution.item_id == Item.id) & (Contribution.amount > 0))
+        .where(Item.wishlist_id == wishlist_id)
+        .group_by(Item.id)
+        .order_by(Item.created_at)
+    )
+
+
+def main():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    user_id, wishlist_id, item_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    cases = {
+        "user by id": (
+            lambda: select(User).where(User.id == user_id),
+            lambda: queries.user_by_id(user_id),
+        ),
+        "wishlist by owner": (
+            lambda: select(Wishlist).where(Wishlist.id == wishlist_id, Wishlist.user_id == user_id),
+            lambda: queries.wishlist_by_owner(wishlist_id, user_id),
+        ),
+        "contribution by user": (
+            lambda: select(Contribution).where(Contribution.item_id == item_id, Contribution.user_id == user_id),
+            lambda: queries.contribution_by_item_and_user(item_id, user_id),
+        ),
+        "item funding": (
+            lambda: select(
+                func.coalesce(func.sum(Contribution.amount), 0).label("total"),
+                func.count(Contribution.id).label("count"),
+            ).where(Contribution.item_id == item_id, Contribution.amount > 0),
+            lambda: queries.item_funding(item_id),
+        ),
+        "items with funding": (
+            lambda: inline_items_with_funding(wishlist_id),
+            lambda: queries.items_with_funding(wishlist_id),
+        ),
+    }
+    print(f"{'query':<22} {'inline us':>10} {'catalog us':>11} {'saved':>7}")
+    with Session(engine) as db:
+        for name, (inline, catalog) in cases.items():
+            inline_seconds = timeit.timeit(lambda: db.execute(inline()).all(), number=N)
+            catalog_seconds = timeit.timeit(lambda: db.execute(catalog()).all(), number=N)
+            saved = 1 - catalog_seconds / inline_seconds
+            print(f"{name:<22} {inline_seconds / N * 1e6:>10.2f} {catalog_seconds / N * 1e6:>11.2f} {saved:>7.0%}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
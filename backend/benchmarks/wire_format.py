@@ -0,0 +1,45 @@
+"""Encode cost and bytes per funding event, JSON vs msgpack packets.
+
+Both are measured as complete Socket.IO packets, the way the server
+frames them before handing them to Engine.IO.
+
+Usage:
+    python -m benchmarks.wire_format
+"""
+import timeit
+import uuid
+
+from socketio import packet
+
+from app.websocket.wire import encode_binary, encode_json
+
+N = 100_000
+
+
+def socketio_packet(event: str, payload):
+    return packet.Packet(packet.EVENT, data=[event, payload]).encode()
+
+
+def size(encoded) -> int:
+    if isinstance(encoded, str):
+        return len(encoded.encode())
+    return sum(size(part) if isinstance(part, str) else len(part) for part in encoded)
+
+
+def main():
+    item_id = str(uuid.uuid4())
+    cases = {
+        "json": lambda: socketio_packet("item_updated", encode_json(item_id, 12_500, 3, "PARTIALLY_FUNDED")),
+        "msgpack (first)": lambda: socketio_packet(
+            "item_updated_bin", encode_binary(7, 12_500, 3, "PARTIALLY_FUNDED", item_id)
+        ),
+        "msgpack (interned)": lambda: socketio_packet("item_updated_bin", encode_binary(7, 12_500, 3, "PARTIALLY_FUNDED")),
+    }
+    print(f"{'format':<20} {'us/event':>10} {'bytes/event':>12}")
+    for name, encode in cases.items():
+        seconds = timeit.timeit(encode, number=N)
+        print(f"{name:<20} {seconds / N * 1e6:>10.2f} {size(encode()):>12}")
+
+
+if __name__ == "__main__":
+    main()
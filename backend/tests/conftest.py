@@ -0,0 +1,111 @@
+import os
+import tempfile
+import time
+import uuid
+
+# Run the whole API against a throwaway SQLite database
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/test.db"
+
+import httpx
+import pytest
+from sqlalchemy import event, insert
+
+from app.database import async_session, create_schema, engine
+from app.main import app
+from app.models.user import User
+from app.services.auth import create_access_token
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def client():
+    await create_schema()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+    # aiosqlite connections are tied to the test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+def auth_headers():
+    """Bearer headers for a user id, minted without a login round trip."""
+
+    def make(user_id: uuid.UUID) -> dict:
+        return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+    return make
+
+
+@pytest.fixture
+def create_users(client):
+    """Insert users straight into the database; returns their ids by name."""
+
+    async def make(*names, password_hash: str = "x") -> dict:
+        ids = {name: uuid.uuid4() for name in names}
+        async with async_session() as db:
+            await db.execute(insert(User), [
+                {"id": user_id, "email": f"{user_id.hex}@example.com", "password_hash": password_hash}
+                for user_id in ids.values()
+            ])
+            await db.commit()
+        return ids
+
+    return make
+
+
+@pytest.fixture
+def register(client):
+    """Sign up a fresh user through the API; returns their auth headers."""
+
+    async def make() -> dict:
+        response = await client.post(
+            "/api/auth/register", json={"email": f"{uuid.uuid4().hex}@example.com", "password": "secret123"}
+        )
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    return make
+
+
+class QueryCounter:
+    """Counts SQL statements and DB time while used as a context manager."""
+
+    def __init__(self):
+        self.active = False
+        self.count = 0
+        self.elapsed = 0.0
+        self.statements = []
+
+    def __enter__(self):
+        self.active = True
+        self.count = 0
+        self.elapsed = 0.0
+        self.statements = []
+        return self
+
+    def __exit__(self, *exc):
+        self.active = False
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_counter_started"] = time.perf_counter()
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        # Transaction control is not a query; asyncpg doesn't even route it here
+        if not self.active or statement.startswith("BEGIN"):
+            return
+        self.count += 1
+        self.elapsed += time.perf_counter() - conn.info.pop("query_counter_started")
+        self.statements.append(statement)
+
+
+@pytest.fixture
+def queries():
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter.before)
+    event.listen(engine.sync_engine, "after_cursor_execute", counter.after)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter.before)
+    event.remove(engine.sync_engine, "after_cursor_execute", counter.after)
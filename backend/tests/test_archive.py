@@ -0,0 +1,132 @@
+import json
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import insert, inspect
+
+from app.database import async_session, engine, upgrade_schema
+from app.models.wishlist import Wishlist
+from app.models.item import Item
+from app.models.contribution import Contribution
+from app.models.archive import ArchivedWishlist, ArchivedItem, ArchivedContribution
+from app.services import archive
+from app.services.archive import archive_expired_wishlists
+from app.services.export import full_export_statement, stream_export
+from app.services.public_cache import public_breaker
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def ids(create_users) -> dict:
+    """A wishlist whose event ended well before the grace period, with one
+    item funded by a guest, next to one whose event is still ahead."""
+    ids = await create_users("owner", "guest")
+    ids.update({name: uuid.uuid4() for name in ("wishlist", "upcoming", "item", "contribution")})
+    ids["slug"] = uuid.uuid4().hex
+    async with async_session() as db:
+        await db.execute(insert(Wishlist), [
+            {
+                "id": ids["wishlist"], "user_id": ids["owner"], "title": "Old birthday", "slug": ids["slug"],
+                "event_date": date.today() - timedelta(days=365),
+            },
+            {
+                "id": ids["upcoming"], "user_id": ids["owner"], "title": "Next birthday", "slug": uuid.uuid4().hex,
+                "event_date": date.today() + timedelta(days=30),
+            },
+        ])
+        await db.execute(insert(Item), [{"id": ids["item"], "wishlist_id": ids["wishlist"], "name": "Kite", "price": 100}])
+        await db.execute(insert(Contribution), [
+            {"id": ids["contribution"], "item_id": ids["item"], "user_id": ids["guest"], "amount": 40},
+        ])
+        await db.commit()
+    return ids
+
+
+async def test_archive_moves_wishlist_with_items_and_contributions(client, ids):
+    assert await archive_expired_wishlists() >= 1
+
+    async with async_session() as db:
+        assert await db.get(Wishlist, ids["wishlist"]) is None
+        assert await db.get(Wishlist, ids["upcoming"]) is not None
+        # Removed by ON DELETE CASCADE, not by the archiver
+        assert await db.get(Item, ids["item"]) is None
+        assert await db.get(Contribution, ids["contribution"]) is None
+
+        archived = await db.get(ArchivedWishlist, ids["wishlist"])
+        assert (archived.slug, archived.user_id, archived.title) == (ids["slug"], ids["owner"], "Old birthday")
+        assert archived.archived_at is not None
+        assert (await db.get(ArchivedItem, ids["item"])).wishlist_id == ids["wishlist"]
+        contribution = await db.get(ArchivedContribution, ids["contribution"])
+        assert (contribution.item_id, contribution.user_id, contribution.amount) == (ids["item"], ids["guest"], 40)
+
+    response = await client.get(f"/api/wishlists/public/{ids['slug']}")
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["archived"] is True
+    assert payload["id"] == str(ids["wishlist"])
+    [item] = payload["items"]
+    assert (item["name"], item["total_funded"], item["contributor_count"], item["status"]) == (
+        "Kite", 40, 1, "PARTIALLY_FUNDED"
+    )
+
+
+async def _ndjson(stmt) -> list[dict]:
+    chunks = [chunk async for chunk in stream_export(stmt, "ndjson")]
+    return [json.loads(line) for line in "".join(chunks).splitlines()]
+
+
+async def test_exports_include_archived_rows(client, ids, auth_headers):
+    await archive_expired_wishlists()
+
+    archived = {row["id"] for row in await _ndjson(full_export_statement("archived_wishlists"))}
+    assert str(ids["wishlist"]) in archived
+    archived_items = await _ndjson(full_export_statement("archived_items"))
+    assert any(row["id"] == str(ids["item"]) and row["archived_at"] for row in archived_items)
+
+    owner = auth_headers(ids["owner"])
+    response = await client.get("/api/exports/wishlists", params={"format": "ndjson"}, headers=owner)
+    # Live and archived lists alike
+    assert {json.loads(line)["id"] for line in response.text.splitlines()} == {
+        str(ids["wishlist"]), str(ids["upcoming"])
+    }
+    response = await client.get("/api/exports/items", params={"format": "ndjson"}, headers=owner)
+    assert [json.loads(line)["id"] for line in response.text.splitlines()] == [str(ids["item"])]
+
+    response = await client.get(
+        "/api/exports/contributions", params={"format": "ndjson"}, headers=auth_headers(ids["guest"])
+    )
+    assert [json.loads(line)["amount"] for line in response.text.splitlines()] == [40]
+
+
+def public_breaker_failures() -> int:
+    return sum(1 for _, ok in public_breaker.outcomes if not ok)
+
+
+async def test_missing_archive_tables_degrade_to_plain_404(client, monkeypatch):
+    # A database from before the archive existed, until upgrade-schema runs
+    monkeypatch.setattr(archive, "archive_tables_ready", True)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ALTER TABLE archived_wishlists RENAME TO archived_wishlists_away")
+    try:
+        assert not await archive.check_archive_tables()
+        failures = public_breaker_failures()
+        response = await client.get(f"/api/wishlists/public/{uuid.uuid4().hex}")
+        assert response.status_code == 404
+        assert public_breaker_failures() == failures
+    finally:
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("ALTER TABLE archived_wishlists_away RENAME TO archived_wishlists")
+    assert await archive.check_archive_tables()
+
+
+async def test_upgrade_schema_restores_event_date_index(client):
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP INDEX ix_wishlists_event_date")
+    await upgrade_schema()
+    await upgrade_schema()
+
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes("wishlists"))
+    assert "ix_wishlists_event_date" in {index["name"] for index in indexes}
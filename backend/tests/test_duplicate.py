@@ -0,0 +1,81 @@
+import uuid
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.database import async_session
+from app.models.wishlist import Wishlist
+from app.models.item import Item
+from app.models.contribution import Contribution
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def ids(create_users, auth_headers) -> dict:
+    """A wishlist with one available, one partially and one fully funded
+    item, listed in that order."""
+    ids = await create_users("owner", "guest")
+    ids.update({name: uuid.uuid4() for name in ("wishlist", "available", "partial", "full")})
+    async with async_session() as db:
+        await db.execute(insert(Wishlist), [
+            {"id": ids["wishlist"], "user_id": ids["owner"], "title": "Birthday", "slug": uuid.uuid4().hex},
+        ])
+        for name in ("available", "partial", "full"):
+            await db.execute(insert(Item), [{"id": ids[name], "wishlist_id": ids["wishlist"], "name": name, "price": 100}])
+        await db.execute(insert(Contribution), [
+            {"item_id": ids["partial"], "user_id": ids["guest"], "amount": 40},
+            {"item_id": ids["full"], "user_id": ids["guest"], "amount": 100},
+        ])
+        await db.commit()
+    ids["headers"] = auth_headers(ids["owner"])
+    return ids
+
+
+async def test_duplicate_copies_items_without_contributions(client, ids):
+    response = await client.post(
+        f"/api/wishlists/{ids['wishlist']}/duplicate", json={"title": "Next birthday"}, headers=ids["headers"]
+    )
+    assert response.status_code == 201
+    copy = response.json()
+    assert copy["id"] != str(ids["wishlist"])
+    assert (copy["user_id"], copy["title"]) == (str(ids["owner"]), "Next birthday")
+
+    items = (await client.get(f"/api/wishlists/{copy['id']}/items/")).json()
+    assert [item["name"] for item in items] == ["available", "partial", "full"]
+    assert {item["wishlist_id"] for item in items} == {copy["id"]}
+    assert {item["status"] for item in items} == {"AVAILABLE"}
+    assert {item["total_funded"] for item in items} == {0}
+
+    copied_ids = [uuid.UUID(item["id"]) for item in items]
+    assert not set(copied_ids) & {ids["available"], ids["partial"], ids["full"]}
+    assert all(item_id.version == 4 and item_id.variant == uuid.RFC_4122 for item_id in copied_ids)
+
+    async with async_session() as db:
+        contributions = await db.execute(select(Contribution.id).where(Contribution.item_id.in_(copied_ids)))
+        assert contributions.all() == []
+
+    # The source list keeps its items and funding
+    source = (await client.get(f"/api/wishlists/{ids['wishlist']}/items/")).json()
+    assert [item["status"] for item in source] == ["AVAILABLE", "PARTIALLY_FUNDED", "FULLY_FUNDED"]
+
+
+async def test_duplicate_filters_items_by_status(client, ids):
+    response = await client.post(
+        f"/api/wishlists/{ids['wishlist']}/duplicate",
+        json={"statuses": ["AVAILABLE", "PARTIALLY_FUNDED"]},
+        headers=ids["headers"],
+    )
+    assert response.status_code == 201
+    copy = response.json()
+    assert copy["title"] == "Birthday"
+
+    items = (await client.get(f"/api/wishlists/{copy['id']}/items/")).json()
+    assert [item["name"] for item in items] == ["available", "partial"]
+
+
+async def test_duplicate_requires_ownership(client, ids, auth_headers):
+    response = await client.post(
+        f"/api/wishlists/{ids['wishlist']}/duplicate", json={}, headers=auth_headers(ids["guest"])
+    )
+    assert response.status_code == 404
@@ -0,0 +1,134 @@
+import uuid
+
+import pytest
+
+from app.websocket import manager
+from app.websocket.presence import Presence
+
+pytestmark = pytest.mark.anyio
+
+
+def test_join_and_leave_keep_both_indexes_in_step():
+    presence = Presence(max_rooms_per_connection=5)
+    assert presence.join("s1", "w1")
+    assert presence.join("s2", "w1")
+    assert presence.join("s1", "w2")
+    assert presence.rooms == {"w1": {"s1", "s2"}, "w2": {"s1"}}
+    assert presence.connections == {"s1": {"w1", "w2"}, "s2": {"w1"}}
+
+    assert not presence.leave("s1", "w1")
+    assert presence.leave("s1", "w2")
+    assert presence.rooms == {"w1": {"s2"}}
+    assert presence.connections == {"s2": {"w1"}}
+    assert not presence.leave("s1", "w1")
+
+
+def test_rejoining_a_room_is_a_no_op():
+    presence = Presence(max_rooms_per_connection=1)
+    assert presence.join("s1", "w1")
+    presence.drain_dirty()
+    assert presence.join("s1", "w1")
+    assert presence.drain_dirty() == {}
+
+
+def test_join_is_capped_per_connection():
+    presence = Presence(max_rooms_per_connection=2)
+    assert presence.join("s1", "w1")
+    assert presence.join("s1", "w2")
+    assert not presence.join("s1", "w3")
+    assert not presence.has_viewers("w3")
+    # The cap is per connection, not global
+    assert presence.join("s2", "w3")
+
+
+def test_disconnect_returns_emptied_rooms():
+    presence = Presence(max_rooms_per_connection=5)
+    presence.join("s1", "w1")
+    presence.join("s1", "w2")
+    presence.join("s2", "w2")
+    assert presence.disconnect("s1") == ["w1"]
+    assert presence.rooms == {"w2": {"s2"}}
+    assert "s1" not in presence.connections
+    assert presence.disconnect("unknown") == []
+
+
+def test_drain_dirty_batches_counts_per_room():
+    presence = Presence(max_rooms_per_connection=5)
+    presence.join("s1", "w1")
+    presence.join("s2", "w1")
+    presence.join("s3", "w1")
+    presence.leave("s3", "w1")
+    presence.join("s1", "w2")
+    presence.leave("s1", "w2")
+
+    # One count per changed room, emptied rooms are skipped
+    assert presence.drain_dirty() == {"w1": 2}
+    assert presence.drain_dirty() == {}
+
+
+def test_stats():
+    presence = Presence(max_rooms_per_connection=5)
+    presence.join("s1", "w1")
+    presence.join("s2", "w1")
+    stats = presence.stats()
+    assert (stats["rooms"], stats["sockets"], stats["memberships"]) == (1, 2, 2)
+    assert stats["memory_bytes"] > 0
+
+
+@pytest.fixture
+def sockets(monkeypatch):
+    """The Socket.IO handlers with fresh presence state, no real server
+    rooms and a fixed set of existing wishlists."""
+    entered = []
+    existing = set()
+
+    async def enter_room(sid, room):
+        entered.append((sid, room))
+
+    async def wishlist_exists(wishlist_id):
+        return wishlist_id in existing
+
+    monkeypatch.setattr(manager, "presence", Presence(max_rooms_per_connection=2))
+    monkeypatch.setattr(manager, "_interners", {})
+    monkeypatch.setattr(manager.sio, "enter_room", enter_room)
+    monkeypatch.setattr(manager, "_wishlist_exists", wishlist_exists)
+    return entered, existing
+
+
+@pytest.mark.parametrize("data", [None, "not a dict", {}, {"wishlist_id": "nope"}])
+async def test_join_wishlist_rejects_invalid_ids(sockets, data):
+    assert await manager.join_wishlist("s1", data) == {"error": "Invalid wishlist id"}
+
+
+async def test_join_wishlist_rejects_unknown_wishlist(sockets):
+    entered, _ = sockets
+    ack = await manager.join_wishlist("s1", {"wishlist_id": str(uuid.uuid4())})
+    assert ack == {"error": "Wishlist not found"}
+    assert entered == []
+
+
+async def test_join_wishlist_acks_and_enters_room(sockets):
+    entered, existing = sockets
+    wishlist_id = str(uuid.uuid4())
+    existing.add(wishlist_id)
+
+    # Ids are canonicalised, so any UUID spelling lands in the same room
+    assert await manager.join_wishlist("s1", {"wishlist_id": wishlist_id.upper()}) == {"format": "json"}
+    assert entered == [("s1", f"wishlist_{wishlist_id}")]
+    assert manager.presence.rooms == {wishlist_id: {"s1"}}
+
+
+async def test_join_wishlist_enforces_room_cap(sockets):
+    _, existing = sockets
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    existing.update(ids)
+    assert await manager.join_wishlist("s1", {"wishlist_id": ids[0]}) == {"format": "json"}
+    assert await manager.join_wishlist("s1", {"wishlist_id": ids[1]}) == {"format": "json"}
+    ack = await manager.join_wishlist("s1", {"wishlist_id": ids[2]})
+    assert ack == {"error": "Too many wishlists open on this connection"}
+
+
+async def test_join_wishlist_checks_database(client, monkeypatch):
+    monkeypatch.setattr(manager, "presence", Presence(max_rooms_per_connection=2))
+    ack = await manager.join_wishlist("s1", {"wishlist_id": str(uuid.uuid4())})
+    assert ack == {"error": "Wishlist not found"}
@@ -0,0 +1,105 @@
+import cProfile
+from datetime import datetime, timedelta, timezone
+
+import jwt as pyjwt
+import pytest
+
+from app.config import settings
+from app.middleware import profiling
+from app.middleware.profiling import _has_valid_token, _write_profile, create_profile_token, profile_path, read_profile
+
+
+def scope_with(token: str | bytes | None) -> dict:
+    headers = [] if token is None else [(b"x-profile-token", token if isinstance(token, bytes) else token.encode())]
+    return {"type": "http", "headers": headers}
+
+
+def test_valid_token_enables_profiling():
+    assert _has_valid_token(scope_with(create_profile_token()))
+
+
+def test_expired_token_is_rejected():
+    token = pyjwt.encode(
+        {"scope": "profile", "exp": datetime.now(timezone.utc) - timedelta(minutes=1)},
+        settings.JWT_SECRET,
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    assert not _has_valid_token(scope_with(token))
+
+
+@pytest.mark.parametrize("payload", [{"sub": "user"}, {"scope": "admin"}])
+def test_token_without_profile_scope_is_rejected(payload):
+    payload = {**payload, "exp": datetime.now(timezone.utc) + timedelta(minutes=5)}
+    token = pyjwt.encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    assert not _has_valid_token(scope_with(token))
+
+
+@pytest.mark.parametrize("token", [None, "not-a-jwt", b"\xff\xfe"])
+def test_missing_or_malformed_token_is_rejected(token):
+    assert not _has_valid_token(scope_with(token))
+
+
+def test_token_signed_with_another_secret_is_rejected():
+    token = pyjwt.encode(
+        {"scope": "profile", "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+        "another-secret",
+        algorithm=settings.JWT_ALGORITHM,
+    )
+    assert not _has_valid_token(scope_with(token))
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_MAX_FILES", 3)
+    return tmp_path
+
+
+def write(name: str):
+    profiler = cProfile.Profile()
+    profiler.enable()
+    sum(range(100))
+    profiler.disable()
+    _write_profile(profiler, {"name": name, "method": "GET", "path": "/api/health"})
+
+
+def test_write_profile_keeps_a_bounded_ring(profiles):
+    names = [f"{1700000000000 + i}-{i:08x}" for i in range(5)]
+    for name in names:
+        write(name)
+
+    # The two oldest profiles are dropped together with their metadata
+    assert sorted(p.name for p in profiles.iterdir()) == sorted(
+        f"{name}{suffix}" for name in names[2:] for suffix in (".json", ".prof")
+    )
+    assert [meta["name"] for meta in profiling.list_profiles()] == names[:1:-1]
+
+
+def test_read_profile_includes_stats(profiles):
+    write("1700000000000-0000abcd")
+    profile = read_profile("1700000000000-0000abcd")
+    assert profile["path"] == "/api/health"
+    assert "cumulative" in profile["stats"]
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "../x",
+        "../../etc/passwd",
+        "1700000000000-0000abcd/../x",
+        "1700000000000-0000ABCD",
+        "170000000000-0000abcd",
+        "1700000000000-0000abcd\n",
+        "",
+    ],
+)
+def test_profile_path_rejects_bad_names(profiles, name):
+    assert profile_path(name) is None
+    assert read_profile(name) is None
+
+
+def test_profile_path_requires_an_existing_profile(profiles):
+    assert profile_path("1700000000000-0000abcd") is None
+    write("1700000000000-0000abcd")
+    assert profile_path("1700000000000-0000abcd") == profiles / "1700000000000-0000abcd.prof"
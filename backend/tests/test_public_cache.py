@@ -0,0 +1,169 @@
+import copy
+import time
+
+import pytest
+
+from app.config import settings
+from app.routers import wishlists
+from app.services.public_cache import PublicWishlistCache, public_breaker, public_cache
+
+pytestmark = pytest.mark.anyio
+
+
+def payload(wishlist_id: str, title: str = "Birthday") -> dict:
+    return {"id": wishlist_id, "title": title}
+
+
+def test_cache_is_a_bounded_lru():
+    cache = PublicWishlistCache(max_entries=2)
+    cache.put("a", payload("1"))
+    cache.put("b", payload("2"))
+    cache.get("a")
+    cache.put("c", payload("3"))
+    assert list(cache.entries) == ["a", "c"]
+    assert cache.slugs == {"1": "a", "3": "c"}
+
+
+def test_invalidate_keeps_payload_as_fallback():
+    cache = PublicWishlistCache(max_entries=10)
+    cache.put("a", payload("1"))
+    assert cache.get("a").is_fresh()
+
+    cache.invalidate("1")
+    entry = cache.get("a")
+    assert entry.invalidated and not entry.is_fresh()
+    assert entry.payload == payload("1")
+
+
+def test_entry_goes_stale_after_ttl(monkeypatch):
+    cache = PublicWishlistCache(max_entries=10)
+    cache.put("a", payload("1"))
+    later = time.monotonic() + 3600
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert not cache.get("a").is_fresh()
+
+
+def test_evict_forgets_slug():
+    cache = PublicWishlistCache(max_entries=10)
+    cache.put("a", payload("1"))
+    cache.evict("a")
+    assert cache.get("a") is None
+    cache.invalidate("1")
+    assert cache.slugs == {}
+
+
+def test_put_if_unchanged_skips_read_overtaken_by_a_write():
+    cache = PublicWishlistCache(max_entries=10)
+    cache.put("a", payload("1", "old"))
+    version = cache.version("a")
+    cache.invalidate("1")
+    assert not cache.put_if_unchanged("a", payload("1", "read before the write"), version)
+    assert cache.get("a").invalidated
+
+    version = cache.version("a")
+    assert cache.put_if_unchanged("a", payload("1", "new"), version)
+    assert cache.get("a").is_fresh()
+
+
+def test_put_if_unchanged_skips_read_overtaken_by_another_put_or_evict():
+    cache = PublicWishlistCache(max_entries=10)
+    version = cache.version("a")
+    cache.put("a", payload("1", "newer"))
+    assert not cache.put_if_unchanged("a", payload("1", "older"), version)
+    assert cache.get("a").payload["title"] == "newer"
+
+    version = cache.version("a")
+    cache.evict("a")
+    assert not cache.put_if_unchanged("a", payload("1", "deleted"), version)
+    assert cache.get("a") is None
+
+
+async def test_revalidation_does_not_overwrite_invalidation(monkeypatch):
+    slug = "revalidated-slug"
+    public_cache.put(slug, payload("r1", "stale"))
+
+    async def read_then_write_commits(db, slug):
+        # The write commits and invalidates while the revalidation reads
+        public_cache.invalidate("r1")
+        return payload("r1", "read before the write")
+
+    monkeypatch.setattr(wishlists, "_load_guarded", read_then_write_commits)
+    public_cache.revalidating.add(slug)
+    await wishlists._revalidate(slug)
+
+    entry = public_cache.get(slug)
+    assert entry.invalidated
+    assert entry.payload["title"] == "stale"
+    assert slug not in public_cache.revalidating
+    public_cache.evict(slug)
+
+
+@pytest.fixture
+def db_down(monkeypatch):
+    """Public loads fail the way asyncpg reports an unreachable server."""
+    async def refuse(db, slug):
+        raise ConnectionRefusedError(111, "Connect call failed")
+
+    monkeypatch.setattr(wishlists, "load_public_wishlist", refuse)
+    # Trip quickly, and leave the shared breaker as it was afterwards
+    for name in ("state", "outcomes", "trips", "rejected", "opened_at", "probe_in_flight"):
+        monkeypatch.setattr(public_breaker, name, copy.copy(getattr(public_breaker, name)))
+    monkeypatch.setattr(public_breaker, "min_calls", 3)
+
+
+async def test_connection_refused_serves_stale_and_trips_breaker(client, db_down):
+    slug = "refused-slug"
+    public_cache.put(slug, payload("c1", "cached"))
+    public_cache.invalidate("c1")
+
+    for _ in range(5):
+        response = await client.get(f"/api/wishlists/public/{slug}")
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "STALE"
+        assert response.json()["title"] == "cached"
+    assert public_breaker.state == public_breaker.OPEN
+    assert public_breaker.trips == 1
+
+    response = await client.get("/api/wishlists/public/never-cached-slug")
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    public_cache.evict(slug)
+
+
+async def test_connection_refused_during_revalidation_is_recorded(db_down):
+    slug = "refused-revalidation"
+    public_cache.put(slug, payload("c2", "cached"))
+    public_cache.revalidating.add(slug)
+    await wishlists._revalidate(slug)
+
+    assert public_breaker.outcomes[-1][1] is False
+    assert public_cache.get(slug).payload["title"] == "cached"
+    assert slug not in public_cache.revalidating
+    public_cache.evict(slug)
+
+
+async def test_entry_past_max_stale_is_read_through(client, monkeypatch):
+    slug = "very-stale-slug"
+    public_cache.put(slug, payload("s1", "days old"))
+    public_cache.get(slug).fetched_at -= settings.PUBLIC_CACHE_MAX_STALE_SECONDS + 1
+
+    async def load(db, slug):
+        return payload("s1", "current")
+
+    monkeypatch.setattr(wishlists, "load_public_wishlist", load)
+    response = await client.get(f"/api/wishlists/public/{slug}")
+    assert response.headers["X-Cache"] == "MISS"
+    assert response.json()["title"] == "current"
+    public_cache.evict(slug)
+
+
+async def test_entry_past_max_stale_is_served_while_breaker_is_open(client, db_down):
+    slug = "very-stale-outage"
+    public_cache.put(slug, payload("s2", "days old"))
+    public_cache.get(slug).fetched_at -= settings.PUBLIC_CACHE_MAX_STALE_SECONDS + 1
+    public_breaker._trip()
+
+    response = await client.get(f"/api/wishlists/public/{slug}")
+    assert response.headers["X-Cache"] == "STALE"
+    assert response.json()["title"] == "days old"
+    public_cache.evict(slug)
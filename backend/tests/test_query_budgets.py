@@ -0,0 +1,255 @@
+"""Every route declares how many SQL statements it may run per request.
+
+Each route is exercised against a small and a large seeded wishlist; the
+statement count has to stay within budget and must not change with the
+number of items and contributions, which is what an N+1 looks like.
+"""
+import uuid
+from dataclasses import dataclass
+
+import pytest
+from sqlalchemy import insert
+
+from app.database import async_session
+from app.models.wishlist import Wishlist
+from app.models.item import Item
+from app.models.contribution import Contribution
+from app.routers import auth, wishlists, items, contributions
+from app.services.auth import hash_password
+
+pytestmark = pytest.mark.anyio
+
+SIZES = [1, 1000]
+PASSWORD = "secret123"
+PASSWORD_HASH = hash_password(PASSWORD)
+
+
+@dataclass
+class Seed:
+    owner_email: str
+    owner: dict
+    guest: dict
+    wishlist_id: uuid.UUID
+    slug: str
+    funded_item: uuid.UUID
+    spare_items: list[uuid.UUID]
+    doomed_wishlist_id: uuid.UUID
+
+
+@pytest.fixture
+def seed_wishlist(create_users, auth_headers):
+    async def seed(size: int) -> Seed:
+        """An owner with a wishlist of ``size`` items, each funded by its own
+        contributor, plus spare unfunded items and a second list of the same
+        size to delete."""
+        users = await create_users("owner", "guest", *range(size), password_hash=PASSWORD_HASH)
+        contributor_ids = [users[n] for n in range(size)]
+
+        wishlist_rows, item_rows, contribution_rows = [], [], []
+        for _ in range(2):
+            wishlist_id = uuid.uuid4()
+            wishlist_rows.append(
+                {"id": wishlist_id, "user_id": users["owner"], "title": "Birthday", "slug": uuid.uuid4().hex}
+            )
+            funded = [uuid.uuid4() for _ in range(size)]
+            spare = [uuid.uuid4() for _ in range(3)]
+            item_rows += [
+                {"id": item_id, "wishlist_id": wishlist_id, "name": "Gift", "price": 100}
+                for item_id in funded + spare
+            ]
+            contribution_rows += [
+                {"item_id": item_id, "user_id": user_id, "amount": 1}
+                for item_id, user_id in zip(funded, contributor_ids)
+            ]
+
+        async with async_session() as db:
+            await db.execute(insert(Wishlist), wishlist_rows)
+            await db.execute(insert(Item), item_rows)
+            await db.execute(insert(Contribution), contribution_rows)
+            await db.commit()
+
+        return Seed(
+            owner_email=f"{users['owner'].hex}@example.com",
+            owner=auth_headers(users["owner"]),
+            guest=auth_headers(users["guest"]),
+            wishlist_id=wishlist_rows[0]["id"],
+            slug=wishlist_rows[0]["slug"],
+            funded_item=item_rows[0]["id"],
+            spare_items=[row["id"] for row in item_rows[size:size + 3]],
+            doomed_wishlist_id=wishlist_rows[1]["id"],
+        )
+
+    return seed
+
+
+# (method, route path) -> (budget, scenario)
+SCENARIOS = {}
+
+
+def scenario(method: str, path: str, budget: int):
+    def register(fn):
+        SCENARIOS[(method, path)] = (budget, fn)
+        return fn
+    return register
+
+
+# Auth
+
+@scenario("POST", "/api/auth/register", budget=3)
+async def register(client, seed, queries):
+    with queries:
+        return await client.post(
+            "/api/auth/register", json={"email": f"{uuid.uuid4().hex}@example.com", "password": PASSWORD}
+        )
+
+
+@scenario("POST", "/api/auth/login", budget=1)
+async def login(client, seed, queries):
+    with queries:
+        return await client.post("/api/auth/login", json={"email": seed.owner_email, "password": PASSWORD})
+
+
+@scenario("POST", "/api/auth/logout", budget=0)
+async def logout(client, seed, queries):
+    with queries:
+        return await client.post("/api/auth/logout")
+
+
+@scenario("GET", "/api/auth/me", budget=1)
+async def me(client, seed, queries):
+    with queries:
+        return await client.get("/api/auth/me", headers=seed.owner)
+
+
+# Wishlists
+
+@scenario("POST", "/api/wishlists/", budget=3)
+async def create_wishlist(client, seed, queries):
+    with queries:
+        return await client.post("/api/wishlists/", json={"title": "Christmas"}, headers=seed.owner)
+
+
+@scenario("GET", "/api/wishlists/", budget=2)
+async def list_wishlists(client, seed, queries):
+    with queries:
+        return await client.get("/api/wishlists/", headers=seed.owner)
+
+
+@scenario("GET", "/api/wishlists/{wishlist_id}", budget=2)
+async def get_wishlist(client, seed, queries):
+    with queries:
+        return await client.get(f"/api/wishlists/{seed.wishlist_id}", headers=seed.owner)
+
+
+@scenario("PUT", "/api/wishlists/{wishlist_id}", budget=4)
+async def update_wishlist(client, seed, queries):
+    with queries:
+        return await client.put(f"/api/wishlists/{seed.wishlist_id}", json={"title": "Renamed"}, headers=seed.owner)
+
+
+@scenario("DELETE", "/api/wishlists/{wishlist_id}", budget=3)
+async def delete_wishlist(client, seed, queries):
+    with queries:
+        return await client.delete(f"/api/wishlists/{seed.doomed_wishlist_id}", headers=seed.owner)
+
+
+@scenario("GET", "/api/wishlists/public/{slug}", budget=2)
+async def get_public_wishlist(client, seed, queries):
+    with queries:
+        return await client.get(f"/api/wishlists/public/{seed.slug}")
+
+
+@scenario("POST", "/api/wishlists/{wishlist_id}/duplicate", budget=4)
+async def duplicate_wishlist(client, seed, queries):
+    with queries:
+        return await client.post(
+            f"/api/wishlists/{seed.wishlist_id}/duplicate", json={"statuses": ["PARTIALLY_FUNDED"]}, headers=seed.owner
+        )
+
+
+# Items
+
+@scenario("POST", "/api/wishlists/{wishlist_id}/items/", budget=4)
+async def create_item(client, seed, queries):
+    with queries:
+        return await client.post(
+            f"/api/wishlists/{seed.wishlist_id}/items/", json={"name": "Book", "price": 2000}, headers=seed.owner
+        )
+
+
+@scenario("GET", "/api/wishlists/{wishlist_id}/items/", budget=1)
+async def list_items(client, seed, queries):
+    with queries:
+        return await client.get(f"/api/wishlists/{seed.wishlist_id}/items/")
+
+
+@scenario("PUT", "/api/wishlists/{wishlist_id}/items/{item_id}", budget=6)
+async def update_item(client, seed, queries):
+    with queries:
+        return await client.put(
+            f"/api/wishlists/{seed.wishlist_id}/items/{seed.spare_items[0]}", json={"price": 3000}, headers=seed.owner
+        )
+
+
+@scenario("DELETE", "/api/wishlists/{wishlist_id}/items/{item_id}", budget=4)
+async def delete_item(client, seed, queries):
+    with queries:
+        return await client.delete(f"/api/wishlists/{seed.wishlist_id}/items/{seed.funded_item}", headers=seed.owner)
+
+
+# Contributions
+
+@scenario("POST", "/api/items/{item_id}/contributions/", budget=7)
+async def create_contribution(client, seed, queries):
+    with queries:
+        return await client.post(
+            f"/api/items/{seed.spare_items[0]}/contributions/", json={"amount": 10}, headers=seed.guest
+        )
+
+
+@scenario("POST", "/api/items/{item_id}/contributions/reserve", budget=6)
+async def reserve_item(client, seed, queries):
+    with queries:
+        return await client.post(f"/api/items/{seed.spare_items[0]}/contributions/reserve", headers=seed.guest)
+
+
+@scenario("PUT", "/api/items/{item_id}/contributions/", budget=7)
+async def update_contribution(client, seed, queries):
+    await client.post(f"/api/items/{seed.spare_items[0]}/contributions/", json={"amount": 10}, headers=seed.guest)
+    with queries:
+        return await client.put(
+            f"/api/items/{seed.spare_items[0]}/contributions/", json={"amount": 20}, headers=seed.guest
+        )
+
+
+@scenario("GET", "/api/items/{item_id}/contributions/mine", budget=2)
+async def get_my_contribution(client, seed, queries):
+    with queries:
+        return await client.get(f"/api/items/{seed.funded_item}/contributions/mine", headers=seed.guest)
+
+
+def test_every_route_declares_a_budget():
+    routes = {
+        (method, route.path)
+        for module in (auth, wishlists, items, contributions)
+        for route in module.router.routes
+        for method in route.methods
+    }
+    assert routes - SCENARIOS.keys() == set()
+
+
+@pytest.mark.parametrize("route", sorted(SCENARIOS), ids=lambda r: f"{r[0]} {r[1]}")
+async def test_query_budget(route, client, queries, seed_wishlist):
+    budget, run = SCENARIOS[route]
+    counts = {}
+    for size in SIZES:
+        seed = await seed_wishlist(size)
+        response = await run(client, seed, queries)
+        assert response.status_code < 400, response.text
+        assert queries.count <= budget, (
+            f"{size} items: {queries.count} queries ({queries.elapsed * 1000:.1f} ms) "
+            f"over budget {budget}:\n" + "\n".join(queries.statements)
+        )
+        counts[size] = queries.count
+
+    assert len(set(counts.values())) == 1, f"query count scales with data size: {counts}"
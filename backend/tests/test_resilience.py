@@ -0,0 +1,188 @@
+import asyncio
+
+import pytest
+
+from app.services import resilience
+from app.services.resilience import CircuitBreaker, ConcurrencyLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_limiter_admits_up_to_limit():
+    limiter = ConcurrencyLimiter(limit=2, queue_size=0, queue_timeout=1)
+    assert await limiter.acquire()
+    assert await limiter.acquire()
+    assert not await limiter.acquire()
+    assert limiter.stats() == {
+        "limit": 2, "active": 2, "queued": 0, "queue_size": 0, "admitted": 2, "shed": 1, "timeouts": 0,
+    }
+
+
+async def test_limiter_hands_released_slot_to_oldest_waiter():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=2, queue_timeout=1)
+    assert await limiter.acquire()
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.stats()["queued"] == 2
+
+    limiter.release()
+    assert await first
+    assert not second.done()
+    assert limiter.active == 1
+
+    limiter.release()
+    assert await second
+    limiter.release()
+    assert limiter.active == 0
+    assert limiter.stats()["admitted"] == 3
+
+
+async def test_limiter_sheds_when_queue_is_full():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=1)
+    assert await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not await limiter.acquire()
+    assert limiter.shed == 1
+
+    limiter.release()
+    assert await queued
+
+
+async def test_limiter_times_out_queued_caller():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=0.01)
+    assert await limiter.acquire()
+    assert not await limiter.acquire()
+    assert limiter.timeouts == 1
+    assert limiter.stats()["queued"] == 0
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+async def test_limiter_keeps_slot_handed_over_as_wait_times_out(monkeypatch):
+    # Python 3.12's wait_for raises TimeoutError even if the waiter got its
+    # result in the same tick as the deadline
+    async def racing_wait_for(waiter, timeout):
+        limiter.release()
+        raise asyncio.TimeoutError
+
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=1)
+    assert await limiter.acquire()
+    monkeypatch.setattr(resilience.asyncio, "wait_for", racing_wait_for)
+    assert await limiter.acquire()
+    assert limiter.active == 1
+    assert limiter.timeouts == 0
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+async def test_limiter_cancelled_waiter_leaves_queue():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=1)
+    assert await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert limiter.stats()["queued"] == 0
+
+    limiter.release()
+    assert limiter.active == 0
+
+
+async def test_limiter_cancelled_after_handover_does_not_leak():
+    limiter = ConcurrencyLimiter(limit=1, queue_size=1, queue_timeout=1)
+    assert await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    limiter.release()
+    waiting.cancel()
+    try:
+        # Python 3.11's wait_for lets the handed-over result win
+        assert await waiting
+        limiter.release()
+    except asyncio.CancelledError:
+        pass
+    assert limiter.active == 0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    return fake
+
+
+def breaker() -> CircuitBreaker:
+    return CircuitBreaker(failure_rate=0.5, min_calls=4, window=30, reset_timeout=15)
+
+
+def test_breaker_trips_at_failure_rate(clock):
+    cb = breaker()
+    for ok in (True, True, False):
+        cb.record_success() if ok else cb.record_failure()
+    assert cb.state == cb.CLOSED
+    cb.record_failure()
+    assert cb.state == cb.OPEN
+    assert cb.trips == 1
+    assert not cb.allow()
+    assert cb.rejected == 1
+
+
+def test_breaker_forgets_outcomes_outside_window(clock):
+    cb = breaker()
+    for _ in range(3):
+        cb.record_failure()
+    clock.now += 31
+    cb.record_success()
+    cb.record_failure()
+    assert cb.state == cb.CLOSED
+
+
+def test_breaker_half_open_lets_one_probe_through(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record_failure()
+    clock.now += 10
+    assert cb.retry_after() == 5
+    clock.now += 5
+    assert cb.allow()
+    assert cb.state == cb.HALF_OPEN
+    assert not cb.allow()
+
+    cb.record_success()
+    assert cb.state == cb.CLOSED
+    assert cb.allow()
+
+
+def test_breaker_failed_probe_reopens(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record_failure()
+    clock.now += 15
+    assert cb.allow()
+    cb.record_failure()
+    assert cb.state == cb.OPEN
+    assert cb.trips == 2
+
+
+def test_breaker_released_probe_frees_the_slot(clock):
+    cb = breaker()
+    for _ in range(4):
+        cb.record_failure()
+    clock.now += 15
+    assert cb.allow()
+    cb.release()
+    assert cb.state == cb.HALF_OPEN
+    assert cb.allow()
@@ -0,0 +1,34 @@
+import pytest
+
+from app.middleware.scheduler import route_class, scheduler
+from app.services.resilience import ConcurrencyLimiter
+
+pytestmark = pytest.mark.anyio
+
+ORIGIN = "http://localhost:3000"
+
+
+@pytest.mark.parametrize("scope, expected", [
+    ({"type": "http", "method": "POST", "path": "/api/auth/login"}, "auth"),
+    ({"type": "http", "method": "POST", "path": "/api/auth/register/"}, "auth"),
+    ({"type": "http", "method": "GET", "path": "/api/auth/me"}, "owner_read"),
+    ({"type": "http", "method": "GET", "path": "/api/wishlists/public/abc"}, "public_read"),
+    ({"type": "http", "method": "POST", "path": "/api/items/x/contributions/"}, "contribution_write"),
+    ({"type": "http", "method": "GET", "path": "/api/items/x/contributions/mine"}, "owner_read"),
+    ({"type": "http", "method": "OPTIONS", "path": "/api/auth/login"}, None),
+    ({"type": "http", "method": "GET", "path": "/socket.io/"}, None),
+    ({"type": "http", "method": "GET", "path": "/api/admin/metrics"}, None),
+    ({"type": "websocket", "path": "/socket.io/"}, "websocket"),
+])
+def test_route_class(scope, expected):
+    assert route_class(scope) == expected
+
+
+async def test_shed_response_keeps_cors_headers(client, monkeypatch):
+    monkeypatch.setitem(scheduler.limiters, "public_read", ConcurrencyLimiter(limit=0, queue_size=0, queue_timeout=1))
+    response = await client.get("/api/wishlists/public/anything", headers={"Origin": ORIGIN})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.headers["Access-Control-Allow-Origin"] == ORIGIN
+    assert "retry-after" in response.headers["Access-Control-Expose-Headers"].lower()
+    assert scheduler.limiters["public_read"].shed == 1
@@ -0,0 +1,110 @@
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.archive import archive_expired_wishlists
+from app.services.search import TrigramIndex, _pg_search_statement, search_index
+
+pytestmark = pytest.mark.anyio
+
+
+def doc(index: TrigramIndex, kind: str, title: str, wishlist_id="w1") -> tuple:
+    key = (kind, uuid.uuid4())
+    index.add(key, title, {"kind": kind, "id": key[1], "wishlist_id": wishlist_id, "title": title})
+    return key
+
+
+def test_trigram_index_ranks_and_paginates():
+    index = TrigramIndex()
+    doc(index, "item", "Lego castle")
+    doc(index, "item", "Castles of Europe")
+    doc(index, "item", "Cast iron pan")
+    doc(index, "wishlist", "Birthday")
+
+    results = index.search("castle", limit=10, offset=0)
+    assert [(r["title"], r["score"]) for r in results] == [("Lego castle", 1.0), ("Castles of Europe", 0.8571)]
+    assert [r["title"] for r in index.search("castle", limit=1, offset=1)] == ["Castles of Europe"]
+    assert index.search("castle", limit=10, offset=2) == []
+
+
+def test_trigram_index_removal_cleans_postings():
+    index = TrigramIndex()
+    kept = doc(index, "item", "Kite", wishlist_id="w1")
+    doc(index, "item", "Kite string", wishlist_id="w2")
+    doc(index, "wishlist", "Kites", wishlist_id="w2")
+
+    index.remove_wishlist("w2")
+    assert [r["title"] for r in index.search("kite", limit=10, offset=0)] == ["Kite"]
+    assert set(index.by_wishlist) == {"w1"}
+
+    index.remove(kept)
+    assert index.search("kite", limit=10, offset=0) == []
+    assert index.docs == {} and not index.postings
+
+
+def test_pg_search_statement_compiles():
+    sql = str(_pg_search_statement(uuid.uuid4(), "castle", 20, 0).compile(dialect=postgresql.dialect()))
+    assert "word_similarity" in sql
+    assert "<%" in sql
+    assert "UNION ALL" in sql
+    assert "LIMIT" in sql and "OFFSET" in sql
+
+
+@pytest.fixture
+async def indexed(client):
+    await search_index.build()
+    yield client
+    search_index.enabled = False
+    search_index.users.clear()
+
+
+async def titles(client, headers, q: str) -> list[str]:
+    response = await client.get("/api/search/", params={"q": q}, headers=headers)
+    assert response.status_code == 200
+    return sorted(r["title"] for r in response.json())
+
+
+async def test_index_follows_item_and_wishlist_writes(indexed, register):
+    client = indexed
+    headers = await register()
+    wishlist = (await client.post("/api/wishlists/", json={"title": "Kite festival"}, headers=headers)).json()
+    items_url = f"/api/wishlists/{wishlist['id']}/items/"
+    kite = (await client.post(items_url, json={"name": "Stunt kite", "price": 100}, headers=headers)).json()
+    await client.post(items_url, json={"name": "Kite line", "price": 20}, headers=headers)
+    assert await titles(client, headers, "kite") == ["Kite festival", "Kite line", "Stunt kite"]
+
+    # Other users never see these documents
+    assert await titles(client, await register(), "kite") == []
+
+    await client.put(f"{items_url}{kite['id']}", json={"name": "Stunt glider"}, headers=headers)
+    assert await titles(client, headers, "kite") == ["Kite festival", "Kite line"]
+
+    await client.delete(f"{items_url}{kite['id']}", headers=headers)
+    assert await titles(client, headers, "glider") == []
+
+    await client.delete(f"/api/wishlists/{wishlist['id']}", headers=headers)
+    assert await titles(client, headers, "kite") == []
+
+
+async def test_index_follows_duplication_and_archival(indexed, register):
+    client = indexed
+    headers = await register()
+    past = (date.today() - timedelta(days=365)).isoformat()
+    wishlist = (
+        await client.post("/api/wishlists/", json={"title": "Old party", "event_date": past}, headers=headers)
+    ).json()
+    await client.post(f"/api/wishlists/{wishlist['id']}/items/", json={"name": "Balloons", "price": 5}, headers=headers)
+
+    copy = (
+        await client.post(f"/api/wishlists/{wishlist['id']}/duplicate", json={"title": "New party"}, headers=headers)
+    ).json()
+    assert await titles(client, headers, "party") == ["New party", "Old party"]
+    results = (await client.get("/api/search/", params={"q": "balloons"}, headers=headers)).json()
+    assert sorted(r["wishlist_id"] for r in results) == sorted([wishlist["id"], copy["id"]])
+
+    await archive_expired_wishlists()
+    assert await titles(client, headers, "party") == ["New party"]
+    results = (await client.get("/api/search/", params={"q": "balloons"}, headers=headers)).json()
+    assert [r["wishlist_id"] for r in results] == [copy["id"]]
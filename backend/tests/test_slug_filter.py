@@ -0,0 +1,72 @@
+import secrets
+import time
+
+import pytest
+
+from app.services.slug_filter import BloomFilter, MissCache, SlugFilter, slug_filter
+
+pytestmark = pytest.mark.anyio
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    slugs = [secrets.token_urlsafe(16) for _ in range(10_000)]
+    for slug in slugs:
+        bloom.add(slug)
+    assert all(slug in bloom for slug in slugs)
+
+    strangers = [secrets.token_urlsafe(16) for _ in range(10_000)]
+    false_positives = sum(slug in bloom for slug in strangers)
+    assert false_positives < 10_000 * 0.02
+
+
+def test_miss_cache_expires_after_ttl(monkeypatch):
+    misses = MissCache(max_entries=10, ttl=60)
+    misses.add("gone")
+    assert "gone" in misses
+
+    later = time.monotonic() + 61
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert "gone" not in misses
+    assert misses.expires == {}
+
+
+def test_miss_cache_is_a_bounded_lru():
+    misses = MissCache(max_entries=2, ttl=60)
+    for slug in ("a", "b", "a", "c"):
+        misses.add(slug)
+    assert list(misses.expires) == ["a", "c"]
+
+
+def test_created_slug_leaves_miss_cache():
+    slugs = SlugFilter()
+    slugs.record_miss("fresh")
+    assert not slugs.might_exist("fresh")
+    slugs.add("fresh")
+    assert slugs.might_exist("fresh")
+
+
+def test_bloom_rejects_unknown_slugs():
+    slugs = SlugFilter()
+    slugs.bloom = BloomFilter(capacity=100, error_rate=0.01)
+    slugs.add("known")
+    assert slugs.might_exist("known")
+    assert not slugs.might_exist("unknown")
+    assert slugs.bloom_rejects == 1
+
+
+async def test_miss_rate_counts_cached_reads(client, register):
+    headers = await register()
+    wishlist = (await client.post("/api/wishlists/", json={"title": "Birthday"}, headers=headers)).json()
+
+    before = slug_filter.stats()
+    for _ in range(3):
+        assert (await client.get(f"/api/wishlists/public/{wishlist['slug']}")).status_code == 200
+    missing = secrets.token_urlsafe(16)
+    assert (await client.get(f"/api/wishlists/public/{missing}")).status_code == 404
+    after = slug_filter.stats()
+
+    # Two of the four reads were served from the cache without a check
+    assert after["lookups"] - before["lookups"] == 4
+    assert after["checks"] - before["checks"] == 2
+    assert after["misses"] - before["misses"] == 1
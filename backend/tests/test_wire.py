@@ -0,0 +1,121 @@
+import uuid
+
+import msgpack
+import pytest
+
+from app.websocket import manager
+from app.websocket.presence import Presence
+from app.websocket.wire import PACKET_VERSION, STATUS_CODES, ItemInterner, encode_binary, encode_json
+
+pytestmark = pytest.mark.anyio
+
+
+def test_interner_hands_out_dense_indices_once():
+    interner = ItemInterner()
+    assert interner.intern("a") == (0, True)
+    assert interner.intern("b") == (1, True)
+    assert interner.intern("a") == (0, False)
+    assert interner.table() == {"a": 0, "b": 1}
+
+    # The table is a snapshot, not a live view
+    interner.table()["c"] = 2
+    assert interner.intern("c") == (2, True)
+
+
+def test_first_binary_packet_carries_the_uuid():
+    item_id = str(uuid.uuid4())
+    first = msgpack.unpackb(encode_binary(3, 1500, 2, "PARTIALLY_FUNDED", item_id))
+    assert first == [PACKET_VERSION, 3, 1500, 2, STATUS_CODES["PARTIALLY_FUNDED"], uuid.UUID(item_id).bytes]
+
+    interned = msgpack.unpackb(encode_binary(3, 2000, 3, "FULLY_FUNDED"))
+    assert interned == [PACKET_VERSION, 3, 2000, 3, STATUS_CODES["FULLY_FUNDED"]]
+    assert len(encode_binary(3, 2000, 3, "FULLY_FUNDED")) < len(encode_json(item_id, 2000, 3, "FULLY_FUNDED")["itemId"])
+
+
+class BinaryClient:
+    """Decodes item_updated_bin the way the frontend does: the join ack's
+    table first, then ids learned from packets that carry a UUID."""
+
+    STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+    def __init__(self, ack: dict):
+        assert ack["format"] == "msgpack"
+        self.ids = {index: item_id for item_id, index in ack["items"].items()}
+
+    def decode(self, data: bytes) -> tuple[str, int, int, str]:
+        version, index, total, contributors, status, *item_uuid = msgpack.unpackb(data)
+        assert version == PACKET_VERSION
+        if item_uuid:
+            self.ids[index] = str(uuid.UUID(bytes=item_uuid[0]))
+        return self.ids[index], total, contributors, self.STATUSES[status]
+
+
+@pytest.fixture
+def room(monkeypatch):
+    """One existing wishlist and the packets emitted to its rooms."""
+    wishlist_id = str(uuid.uuid4())
+    emitted = []
+
+    async def enter_room(sid, room):
+        pass
+
+    async def emit(event, data, room):
+        emitted.append((event, data, room))
+
+    async def wishlist_exists(requested):
+        return requested == wishlist_id
+
+    monkeypatch.setattr(manager, "presence", Presence(max_rooms_per_connection=5))
+    monkeypatch.setattr(manager, "_interners", {})
+    monkeypatch.setattr(manager.sio, "enter_room", enter_room)
+    monkeypatch.setattr(manager.sio, "emit", emit)
+    monkeypatch.setattr(manager, "_wishlist_exists", wishlist_exists)
+    return wishlist_id, emitted
+
+
+def binary_packets(emitted: list) -> list[bytes]:
+    packets = [data for event, data, _ in emitted if event == "item_updated_bin"]
+    emitted.clear()
+    return packets
+
+
+async def test_join_table_and_packets_let_late_joiners_decode(room):
+    wishlist_id, emitted = room
+    first_item, second_item = str(uuid.uuid4()), str(uuid.uuid4())
+
+    early = BinaryClient(await manager.join_wishlist("s1", {"wishlist_id": wishlist_id, "format": "msgpack"}))
+    assert early.ids == {}
+
+    await manager.broadcast_item_update(wishlist_id, first_item, 500, 1, "PARTIALLY_FUNDED")
+    [packet] = binary_packets(emitted)
+    assert early.decode(packet) == (first_item, 500, 1, "PARTIALLY_FUNDED")
+
+    # A client joining now gets the table instead of the UUID-carrying packet
+    late = BinaryClient(await manager.join_wishlist("s2", {"wishlist_id": wishlist_id, "format": "msgpack"}))
+    await manager.broadcast_item_update(wishlist_id, first_item, 1000, 2, "FULLY_FUNDED")
+    [packet] = binary_packets(emitted)
+    assert len(msgpack.unpackb(packet)) == 5
+    for client in (early, late):
+        assert client.decode(packet) == (first_item, 1000, 2, "FULLY_FUNDED")
+
+    await manager.broadcast_item_update(wishlist_id, second_item, 0, 0, "AVAILABLE")
+    [packet] = binary_packets(emitted)
+    for client in (early, late):
+        assert client.decode(packet) == (second_item, 0, 0, "AVAILABLE")
+
+
+async def test_json_clients_get_full_ids_and_binary_rooms_stay_separate(room):
+    wishlist_id, emitted = room
+    item_id = str(uuid.uuid4())
+    assert await manager.join_wishlist("s1", {"wishlist_id": wishlist_id}) == {"format": "json"}
+
+    await manager.broadcast_item_update(wishlist_id, item_id, 500, 1, "PARTIALLY_FUNDED")
+    # No msgpack client joined, so no interner and no binary packet
+    assert emitted == [("item_updated", encode_json(item_id, 500, 1, "PARTIALLY_FUNDED"), f"wishlist_{wishlist_id}")]
+
+
+async def test_binary_disabled_falls_back_to_json(room, monkeypatch):
+    wishlist_id, _ = room
+    monkeypatch.setattr(manager.settings, "SOCKET_BINARY_ENABLED", False)
+    ack = await manager.join_wishlist("s1", {"wishlist_id": wishlist_id, "format": "msgpack"})
+    assert ack == {"format": "json"}